@@ -0,0 +1,1020 @@
+"""AI integration layer for JARVIS.
+
+Wraps the Anthropic and OpenAI APIs behind a single AIAssistant class and
+routes recognized voice commands to their handlers via CommandProcessor.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import random
+import functools
+import threading
+from collections import deque
+from datetime import datetime
+
+# anthropic/openai (and their httpx/pydantic baggage) are imported lazily in
+# AIAssistant.__init__ only when the matching API key is present, so key-less
+# basic-response mode doesn't pay their import cost at startup.
+
+# Filler tokens stripped before command matching; frozenset membership is
+# O(1) per token. Multi-word fillers ("can you") fall out token by token.
+_FILLERS = frozenset({"please", "can", "you", "could", "would", "jarvis"})
+
+_TIME_FMT = "%I:%M %p"
+_DATE_FMT = "%B %d, %Y"
+
+# One compiled alternation per keyword family: a single C-level regex sweep
+# over the command instead of one Python substring scan per keyword.
+_OPEN_VERBS = re.compile(r'\b(open|launch|start|run)\b')
+_CLOSE_VERBS = re.compile(r'\b(close|quit|exit|kill)\b')
+_MEDIA_VERBS = re.compile(r'\b(play|music|song|video)\b')
+_QUESTION_WORDS = re.compile(r'\b(what|who|when|where|why|how)\b')
+_GREETINGS = re.compile(r'\b(hello|hi|hey|greetings)\b')
+_TIME_WORDS = re.compile(r'\b(time|clock)\b')
+_DATE_WORDS = re.compile(r'\b(date|today)\b')
+_THANKS = re.compile(r'\b(thanks?|thank you)\b')
+
+_SENTENCE_END = re.compile(r'[.!?]\s')
+
+
+@functools.lru_cache(maxsize=256)
+def _analyze_intent(command_lower):
+    """Pure intent classification, memoized per unique utterance.
+
+    Voice commands repeat heavily ("open calculator", "what time is it"),
+    so the regex work runs once per distinct string. Returns a hashable
+    tuple; the public method wraps it back into a dict.
+    """
+    if _OPEN_VERBS.search(command_lower):
+        return ("system", "open", 0.9)
+    if _CLOSE_VERBS.search(command_lower):
+        return ("system", "close", 0.9)
+    if _MEDIA_VERBS.search(command_lower):
+        return ("media", "play", 0.8)
+    if _QUESTION_WORDS.search(command_lower):
+        return ("question", "answer", 0.7)
+    if _GREETINGS.search(command_lower):
+        return ("social", "greet", 0.9)
+    return ("unknown", "general", 0.3)
+
+
+class AIAssistant:
+    """Handles LLM-backed question answering with conversation memory."""
+
+    def __init__(self):
+        self.claude_api_key = os.getenv("ANTHROPIC_API_KEY")
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+
+        self._anthropic = None
+        self._openai = None
+        self._http = None
+        self._http_async = None
+        self.claude_client = None
+        self.openai_client = None
+        self.claude_async = None
+        self.openai_async = None
+
+        if self.claude_api_key or self.openai_api_key:
+            import httpx
+
+            # HTTP/2 needs the optional h2 package (httpx[http2]); with
+            # http2=True and no h2 the first request raises instead of
+            # negotiating down, so only enable it when h2 is importable.
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            # One keep-alive pool shared by both SDKs: a single TLS handshake
+            # per endpoint instead of one per call, and HTTP/2 multiplexing
+            # (when available) if both providers are queried in the same
+            # session. The async twins get their own pool for racing
+            # providers.
+            self._http = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=4, keepalive_expiry=60),
+            )
+            self._http_async = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=4, keepalive_expiry=60),
+            )
+
+        if self.claude_api_key:
+            import anthropic
+
+            self._anthropic = anthropic
+            self.claude_client = anthropic.Anthropic(
+                api_key=self.claude_api_key, http_client=self._http)
+            self.claude_async = anthropic.AsyncAnthropic(
+                api_key=self.claude_api_key, http_client=self._http_async)
+
+        if self.openai_api_key:
+            import openai
+
+            self._openai = openai
+            self.openai_client = openai.OpenAI(
+                api_key=self.openai_api_key, http_client=self._http)
+            self.openai_async = openai.AsyncOpenAI(
+                api_key=self.openai_api_key, http_client=self._http_async)
+
+        self.jarvis_personality = (
+            "You are JARVIS, a sophisticated AI assistant inspired by the one "
+            "from Iron Man. You are helpful, intelligent, and speak with a "
+            "polite, slightly formal tone, addressing the user as 'Sir'. Keep "
+            "your answers concise enough to be spoken aloud."
+        )
+
+        # Split storage: _cache_messages feeds provider APIs directly and is
+        # strictly append-only ({"role","content"} only, stable key order) so
+        # each turn extends the previous prompt prefix byte-for-byte, which is
+        # what provider-side prefix caching matches on. _meta carries the
+        # timestamps and is only read for human-facing summaries.
+        self.max_history_length = 10
+        self._cache_messages = []
+        # maxlen makes head-eviction O(1) with no reallocation; the capped
+        # provider payloads are compacted separately to stay prefix-stable.
+        self._meta = deque(maxlen=self.max_history_length)
+
+        # History is bounded by tokens rather than turn count: one long turn
+        # costs what it costs, ten short ones don't waste the budget.
+        # Compaction folds the oldest turns into a single summary pair once
+        # utilization passes 70%.
+        self._token_budget = 4000
+        self._token_count = 0
+        self._encoder = None
+
+        # Persistent OpenAI payload: [system] + history, grown in place by
+        # add_to_history. The sync ask paths append the volatile turn(s),
+        # send the same list object, and pop them afterwards, so no O(history)
+        # copy is made per call.
+        self._openai_messages = [
+            {"role": "system", "content": self.jarvis_personality},
+        ]
+        # Bumped whenever the stable prefix changes (e.g. personality swap)
+        # so downstream caches know prior prefixes are dead.
+        self._prefix_version = 0
+
+        # First-token fast path for provide_basic_response: for the common
+        # case the triggering word leads the utterance, so one hash lookup
+        # replaces several regex sweeps.
+        self._basic_first_token = {
+            "hello": self._basic_greeting,
+            "hi": self._basic_greeting,
+            "hey": self._basic_greeting,
+            "greetings": self._basic_greeting,
+            "time": self._basic_time,
+            "date": self._basic_date,
+            "today": self._basic_date,
+        }
+
+        # Deferred work destined for the providers' Batch APIs (~50% cheaper
+        # than the synchronous endpoints; fine whenever nobody is waiting).
+        # Flushed once the queue grows large or old enough, and again at
+        # shutdown so nothing enqueued is ever stranded.
+        self._batch_queue = []
+        self._batch_oldest = 0.0
+        self.batch_max_items = 8
+        self.batch_max_age = 300.0
+
+        # One long-lived event loop on its own thread for racing the async
+        # clients; started lazily on the first race.
+        self._async_loop = None
+        self._async_loop_lock = threading.Lock()
+
+        self.max_retries = 3
+        self.retry_base_delay = 1.0
+        self.retry_max_delay = 10.0
+        # Set from Retry-After on a 429; while it's in the future we skip the
+        # provider entirely instead of issuing a doomed call.
+        self._cooldown_until = 0.0
+
+    def should_wait(self):
+        """True while a rate-limit cooldown from a previous 429 is active."""
+        return time.monotonic() < self._cooldown_until
+
+    def _with_retries(self, call, transient_errors):
+        """Run an API call, retrying transient failures with backoff.
+
+        Exponential backoff with jitter, honoring a Retry-After header when
+        the SDK exposes one. The last failure is re-raised for the caller's
+        generic handler to log.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                return call()
+            except transient_errors as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                delay = min(
+                    self.retry_base_delay * 2 ** attempt + random.uniform(0, 1),
+                    self.retry_max_delay,
+                )
+                response = getattr(e, "response", None)
+                retry_after = None
+                if response is not None:
+                    retry_after = response.headers.get("retry-after")
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                        self._cooldown_until = time.monotonic() + delay
+                    except ValueError:
+                        pass
+                time.sleep(delay)
+
+    def _volatile_turns(self, question, context):
+        """The per-call message suffix: optional context plus the question."""
+        turns = []
+        if context:
+            # Volatile context goes in its own late user turn rather than
+            # into the system string, so the system prefix stays stable.
+            turns.append({
+                "role": "user",
+                "content": [{
+                    "type": "text",
+                    "text": f"Context: {context}",
+                    "cache_control": {"type": "ephemeral"},
+                }],
+            })
+        turns.append({"role": "user", "content": question})
+        return turns
+
+    def _build_claude_messages(self, question, context):
+        """Copying assembly used by the async race (shared-state safe)."""
+        return self._cache_messages + self._volatile_turns(question, context)
+
+    def _claude_system_blocks(self):
+        """The cache-marked system prompt shared by sync and async calls."""
+        return [{
+            "type": "text",
+            "text": self.jarvis_personality,
+            "cache_control": {"type": "ephemeral"},
+        }]
+
+    def _openai_volatile_turns(self, question, context):
+        """Per-call suffix for OpenAI: optional context plus the question.
+
+        Context never touches the system string — it rides as a late user
+        turn so the byte-level system prefix stays identical across turns
+        and the provider's implicit prefix cache keeps hitting.
+        """
+        turns = []
+        if context:
+            turns.append({"role": "user", "content": f"Context: {context}"})
+        turns.append({"role": "user", "content": question})
+        return turns
+
+    def _build_openai_messages(self, question, context):
+        """Copying assembly used by the async race (shared-state safe)."""
+        return (self._openai_messages
+                + self._openai_volatile_turns(question, context))
+
+    def ask_claude(self, question, context=None):
+        """Ask Claude a question, using a cache-stable system prompt.
+
+        The personality is sent as a dedicated system block marked with
+        cache_control so Anthropic can reuse the cached prefix across turns;
+        history rides along as ordinary messages and only the new user turn
+        (plus any volatile context) is fresh input.
+        """
+        if not self.claude_client:
+            return None
+
+        messages = self._cache_messages
+        volatile = self._volatile_turns(question, context)
+        messages.extend(volatile)
+        try:
+            response = self._with_retries(
+                lambda: self.claude_client.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=1024,
+                    system=self._claude_system_blocks(),
+                    messages=messages,
+                ),
+                (self._anthropic.RateLimitError,
+                 self._anthropic.APITimeoutError,
+                 self._anthropic.InternalServerError),
+            )
+            return response.content[0].text
+        except Exception as e:
+            print(f"Claude API error: {e}")
+            return None
+        finally:
+            del messages[-len(volatile):]
+
+    def ask_openai(self, question, context=None):
+        """Ask OpenAI's chat API a question with recent history attached."""
+        if not self.openai_client:
+            return None
+
+        messages = self._openai_messages
+        volatile = self._openai_volatile_turns(question, context)
+        messages.extend(volatile)
+        appended = len(volatile)
+        try:
+            response = self._with_retries(
+                lambda: self.openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=messages,
+                    max_tokens=1024,
+                ),
+                (self._openai.RateLimitError,
+                 self._openai.APITimeoutError,
+                 self._openai.InternalServerError),
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"OpenAI API error: {e}")
+            return None
+        finally:
+            if appended:
+                del messages[-appended:]
+
+    def ask_claude_stream(self, question, context=None):
+        """Yield answer text chunk-by-chunk as Claude generates it."""
+        if not self.claude_client:
+            return
+        try:
+            with self.claude_client.messages.stream(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1024,
+                system=self._claude_system_blocks(),
+                messages=self._build_claude_messages(question, context),
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            print(f"Claude API error: {e}")
+
+    def ask_openai_stream(self, question, context=None):
+        """Yield answer text chunk-by-chunk as OpenAI generates it."""
+        if not self.openai_client:
+            return
+        try:
+            response = self.openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=self._build_openai_messages(question, context),
+                max_tokens=1024,
+                stream=True,
+            )
+            for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            print(f"OpenAI API error: {e}")
+
+    def ask_question_stream(self, question, context=None):
+        """Stream the answer so TTS can start before generation finishes.
+
+        Prefers Claude, falls back to OpenAI, then to the offline canned
+        response. History is updated with the full assembled answer.
+        """
+        if self.should_wait():
+            yield self.provide_basic_response(question)
+            return
+
+        parts = []
+        for chunk in self.ask_claude_stream(question, context):
+            parts.append(chunk)
+            yield chunk
+        if not parts:
+            for chunk in self.ask_openai_stream(question, context):
+                parts.append(chunk)
+                yield chunk
+
+        if parts:
+            self.add_to_history(question, "".join(parts))
+        else:
+            yield self.provide_basic_response(question)
+
+    async def ask_claude_async(self, question, context=None):
+        """Async variant of ask_claude used for racing providers."""
+        if not self.claude_async:
+            return None
+        try:
+            response = await self.claude_async.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1024,
+                system=self._claude_system_blocks(),
+                messages=self._build_claude_messages(question, context),
+            )
+            return response.content[0].text
+        except Exception as e:
+            print(f"Claude API error: {e}")
+            return None
+
+    async def ask_openai_async(self, question, context=None):
+        """Async variant of ask_openai used for racing providers."""
+        if not self.openai_async:
+            return None
+        try:
+            response = await self.openai_async.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=self._build_openai_messages(question, context),
+                max_tokens=1024,
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"OpenAI API error: {e}")
+            return None
+
+    async def ask_question_async(self, question, context=None):
+        """Race both providers and return the first non-error answer.
+
+        Hedging hides tail latency: if one provider stalls for many seconds,
+        the other's answer is used and the straggler is cancelled.
+        """
+        if self.should_wait():
+            return self.provide_basic_response(question)
+
+        pending = set()
+        if self.claude_async:
+            pending.add(asyncio.ensure_future(
+                self.ask_claude_async(question, context)))
+        if self.openai_async:
+            pending.add(asyncio.ensure_future(
+                self.ask_openai_async(question, context)))
+        if not pending:
+            return self.provide_basic_response(question)
+
+        answer = None
+        while pending and answer is None:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result:
+                    answer = result
+                    break
+        for task in pending:
+            task.cancel()
+
+        if answer:
+            self.add_to_history(question, answer)
+            return answer
+        return self.provide_basic_response(question)
+
+    def _run_async(self, coro):
+        """Run a coroutine on the persistent background loop.
+
+        The async SDK clients share one httpx pool whose keep-alive
+        connections are bound to the loop that created them; asyncio.run
+        per call would close that loop and strand the pool, failing every
+        race after the first.
+        """
+        with self._async_loop_lock:
+            if self._async_loop is None:
+                self._async_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._async_loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(
+            coro, self._async_loop).result()
+
+    def ask_question(self, question, context=None):
+        """Try Claude first, fall back to OpenAI, then to canned responses.
+
+        When both providers are configured, race them instead and take the
+        first answer to arrive.
+        """
+        if self.should_wait():
+            return self.provide_basic_response(question)
+
+        if self.claude_async and self.openai_async:
+            return self._run_async(self.ask_question_async(question, context))
+
+        answer = self.ask_claude(question, context)
+        if answer:
+            self.add_to_history(question, answer)
+            return answer
+
+        answer = self.ask_openai(question, context)
+        if answer:
+            self.add_to_history(question, answer)
+            return answer
+
+        return self.provide_basic_response(question)
+
+    def add_to_history(self, user_input, ai_response):
+        """Record one exchange; compact from the front only past the cap."""
+        self._cache_messages.append({"role": "user", "content": user_input})
+        self._cache_messages.append({"role": "assistant", "content": ai_response})
+        self._openai_messages.append({"role": "user", "content": user_input})
+        self._openai_messages.append({"role": "assistant", "content": ai_response})
+        self._meta.append({
+            "user_input": user_input,
+            "ai_response": ai_response,
+            "timestamp": datetime.now().isoformat(),
+        })
+        self._token_count += (self._count_tokens(user_input)
+                              + self._count_tokens(ai_response))
+        if self._token_count > self._token_budget * 0.7:
+            self._compact_history()
+
+    def _count_tokens(self, text):
+        """Token count via tiktoken when available, chars/4 otherwise."""
+        if self._encoder is None:
+            try:
+                import tiktoken
+                self._encoder = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                self._encoder = False
+        if self._encoder is False:
+            return max(1, len(text) // 4)
+        return len(self._encoder.encode(text))
+
+    def _summarize_turns(self, messages):
+        """Summarize evicted turns, via the LLM when one is available."""
+        transcript = "\n".join(
+            f"{m['role']}: {m['content']}" for m in messages
+            if isinstance(m["content"], str))
+        if self.openai_client:
+            try:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[{
+                        "role": "user",
+                        "content": ("Summarize this conversation in at most "
+                                    "three sentences:\n" + transcript),
+                    }],
+                    max_tokens=150,
+                )
+                return response.choices[0].message.content
+            except Exception as e:
+                print(f"Summary error: {e}")
+        return transcript[:400]
+
+    def _compact_history(self):
+        """Fold the oldest turns into one summary pair in a single step.
+
+        This deliberately resets the cached prefix once, instead of rewriting
+        the first N turns on every call, which would defeat prefix caching.
+        The summary pair stays user-first so the Claude payload remains valid.
+        """
+        threshold = self._token_budget * 0.7
+        evicted = []
+        while (self._token_count > threshold
+               and len(self._cache_messages) > 2):
+            user_msg = self._cache_messages.pop(0)
+            ai_msg = self._cache_messages.pop(0)
+            evicted.extend((user_msg, ai_msg))
+            self._token_count -= (self._count_tokens(user_msg["content"])
+                                  + self._count_tokens(ai_msg["content"]))
+        if not evicted:
+            return
+
+        summary = self._summarize_turns(evicted)
+        summary_pair = [
+            {"role": "user", "content": "Summarize our conversation so far."},
+            {"role": "assistant", "content": summary},
+        ]
+        self._cache_messages[:0] = summary_pair
+        # Index 0 is the system prompt; history starts at 1.
+        del self._openai_messages[1:1 + len(evicted)]
+        self._openai_messages[1:1] = summary_pair
+        self._token_count += sum(
+            self._count_tokens(m["content"]) for m in summary_pair)
+
+    def get_conversation_summary(self):
+        """Return a short human-readable summary of recent exchanges."""
+        if not self._meta:
+            return "No conversation history yet, Sir."
+
+        lines = []
+        recent = list(self._meta)[-3:]
+        for turn in recent:
+            lines.append(f"You asked: {turn['user_input']}")
+            lines.append(f"I replied: {turn['ai_response'][:80]}")
+        return "\n".join(lines)
+
+    def clear_history(self):
+        """Forget the current conversation."""
+        self._cache_messages = []
+        self._meta.clear()
+        del self._openai_messages[1:]
+        self._token_count = 0
+
+    def set_personality_mode(self, mode):
+        """Switch between a few canned personality prompts."""
+        personalities = {
+            "iron_man": (
+                "You are JARVIS from Iron Man. Polite, formal, witty. "
+                "Address the user as 'Sir'. Keep answers short and speakable."
+            ),
+            "technical": (
+                "You are JARVIS, a technical assistant. Give precise, "
+                "detailed answers aimed at a developer, still speakable aloud."
+            ),
+            "casual": (
+                "You are JARVIS, a friendly casual assistant. Relaxed tone, "
+                "short answers, no formality."
+            ),
+        }
+        if mode in personalities:
+            self.jarvis_personality = personalities[mode]
+            self._openai_messages[0] = {
+                "role": "system", "content": self.jarvis_personality}
+            self._prefix_version += 1
+            return f"Personality set to {mode}, Sir."
+        return "I don't know that personality mode, Sir."
+
+    def analyze_command_intent(self, command, command_lower=None):
+        """Classify a command into a coarse intent bucket.
+
+        Callers that already hold a lowered copy pass it via command_lower
+        to skip the extra allocation.
+        """
+        intent = _analyze_intent(command_lower or command.lower())
+        return dict(zip(("type", "action", "confidence"), intent))
+
+    def enqueue_batch(self, task_kind, payload):
+        """Queue a non-interactive request for the next Batch API flush.
+
+        Flushes automatically once the queue reaches batch_max_items or
+        its oldest entry is batch_max_age seconds old.
+        """
+        if not (self.openai_client or self.claude_client):
+            # No provider to ever submit to; don't grow a queue that
+            # can never drain.
+            return
+        now = time.monotonic()
+        if not self._batch_queue:
+            self._batch_oldest = now
+        self._batch_queue.append({"task_kind": task_kind, "payload": payload})
+        if (len(self._batch_queue) >= self.batch_max_items
+                or now - self._batch_oldest >= self.batch_max_age):
+            self.flush_batch()
+
+    def flush_batch(self):
+        """Submit queued work through a provider Batch API.
+
+        Uses the OpenAI Batch endpoint when that client exists, otherwise
+        Anthropic's Message Batches API, so a Claude-only configuration
+        still drains the queue. Callers poll the returned batch id at
+        their leisure; returns None when there is nothing to flush or no
+        client is configured.
+        """
+        if not self._batch_queue:
+            return None
+        if self.openai_client:
+            return self._flush_batch_openai()
+        if self.claude_client:
+            return self._flush_batch_anthropic()
+        return None
+
+    def _flush_batch_openai(self):
+        """Serialize the queue to JSONL and create an OpenAI batch job."""
+        try:
+            lines = []
+            for index, item in enumerate(self._batch_queue):
+                lines.append(json.dumps({
+                    "custom_id": f"{item['task_kind']}-{index}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": "gpt-3.5-turbo",
+                        "messages": item["payload"],
+                        "max_tokens": 1024,
+                    },
+                }, sort_keys=True))
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            upload = self.openai_client.files.create(
+                file=("jarvis_batch.jsonl", data), purpose="batch")
+            batch = self.openai_client.batches.create(
+                input_file_id=upload.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            self._batch_queue.clear()
+            return batch.id
+        except Exception as e:
+            print(f"Batch submit error: {e}")
+            return None
+
+    def _flush_batch_anthropic(self):
+        """Create an Anthropic message batch from the queue.
+
+        Payloads are stored OpenAI-style; any system turn is lifted out
+        into the request's system parameter since Anthropic takes it
+        separately from the messages list.
+        """
+        try:
+            requests = []
+            for index, item in enumerate(self._batch_queue):
+                system = None
+                messages = []
+                for message in item["payload"]:
+                    if message["role"] == "system":
+                        system = message["content"]
+                    else:
+                        messages.append(message)
+                params = {
+                    "model": "claude-3-5-sonnet-20241022",
+                    "max_tokens": 1024,
+                    "messages": messages,
+                }
+                if system:
+                    params["system"] = system
+                requests.append({
+                    "custom_id": f"{item['task_kind']}-{index}",
+                    "params": params,
+                })
+            batch = self.claude_client.messages.batches.create(
+                requests=requests)
+            self._batch_queue.clear()
+            return batch.id
+        except Exception as e:
+            print(f"Batch submit error: {e}")
+            return None
+
+    def generate_contextual_response(self, command, system_result, background=False):
+        """Produce a short spoken acknowledgment for a system command result.
+
+        Background commands get a canned ack immediately and any LLM polish
+        is deferred to the cheap Batch lane instead of a blocking call.
+        """
+        if background and system_result:
+            self.enqueue_batch("ack", [
+                {"role": "system", "content": self.jarvis_personality},
+                {"role": "user", "content":
+                    f"Briefly acknowledge completing: {command} ({system_result})"},
+            ])
+        if system_result:
+            return f"Done, Sir. {system_result}"
+        return "I'm sorry Sir, I couldn't complete that."
+
+    def _basic_greeting(self):
+        return "Hello Sir, how may I assist you today?"
+
+    def _basic_time(self):
+        return f"The time is {time.strftime(_TIME_FMT, time.localtime())}, Sir."
+
+    def _basic_date(self):
+        return f"Today is {time.strftime(_DATE_FMT, time.localtime())}, Sir."
+
+    def provide_basic_response(self, question, question_lower=None):
+        """Offline fallback when no API key is configured or calls fail."""
+        if question_lower is None:
+            question_lower = question.lower()
+
+        first = question_lower.split(None, 1)[0] if question_lower else ""
+        fast = self._basic_first_token.get(first)
+        if fast:
+            return fast()
+
+        if _GREETINGS.search(question_lower):
+            return "Hello Sir, how may I assist you today?"
+        if _TIME_WORDS.search(question_lower):
+            return self._basic_time()
+        if _DATE_WORDS.search(question_lower):
+            return self._basic_date()
+        if "how are you" in question_lower:
+            return "All systems operational, Sir. How may I help?"
+        if _THANKS.search(question_lower):
+            return "You're most welcome, Sir."
+        return "I'm afraid I need an API connection to answer that, Sir."
+
+
+class CommandProcessor:
+    """Maps recognized speech to handlers via regex patterns."""
+
+    def __init__(self, ai_assistant, system_controller, tts=None):
+        self.ai_assistant = ai_assistant
+        self.system_controller = system_controller
+        # When a TTS engine is attached, general queries stream: each
+        # completed sentence is spoken while the rest is still generating.
+        self.tts = tts
+        # True after a handler already voiced its response itself, so the
+        # caller knows not to queue the returned text a second time.
+        self.spoke_response = False
+
+        self.command_patterns = {
+            r'open\s+(.+)': self.handle_open_app,
+            r'launch\s+(.+)': self.handle_open_app,
+            r'start\s+(.+)': self.handle_open_app,
+            r'close\s+(.+)': self.handle_close_app,
+            r'play\s+(.+)\s+on\s+youtube': self.handle_youtube,
+            r'play\s+(.+)': self.handle_play_music,
+            r'search\s+for\s+(.+)': self.handle_search,
+            r'google\s+(.+)': self.handle_search,
+            r'what\s+time\s+is\s+it': self.handle_time,
+            r'current\s+time': self.handle_time,
+            r'what.*\bdate\b': self.handle_date,
+            r'volume\s+up': self.handle_volume_up,
+            r'volume\s+down': self.handle_volume_down,
+            r'mute': self.handle_mute,
+            r'take\s+a\s+screenshot': self.handle_screenshot,
+            r'screenshot': self.handle_screenshot,
+            r'system\s+info': self.handle_system_info,
+            r'lock\s+the\s+computer': self.handle_lock,
+            r'shutdown': self.handle_shutdown,
+            r'restart': self.handle_restart,
+            r'hello|hi\b|hey': self.handle_greeting,
+            r'how\s+are\s+you': self.handle_how_are_you,
+            r'help': self.handle_help,
+            r'goodbye|bye\b': self.handle_goodbye,
+        }
+
+        # Compile once at startup; process_command then skips both pattern
+        # parsing and the re module's internal cache lookup per command.
+        # Patterns are anchored at the start so a mismatch is rejected after
+        # a couple of character comparisons instead of a sliding scan.
+        self._compiled = [
+            (pattern, self._compile_anchored(pattern), handler)
+            for pattern, handler in self.command_patterns.items()
+        ]
+        self._build_dispatch()
+
+    @staticmethod
+    def _compile_anchored(pattern):
+        """Compile a command pattern anchored to the start of the string."""
+        return re.compile(r'^(?:%s)' % pattern)
+
+    def _build_dispatch(self):
+        """Bucket compiled patterns by their literal leading verb.
+
+        Most patterns are anchored on a distinct first word ("open", "play",
+        "volume", ...), so dispatch becomes one dict lookup plus a regex scan
+        of a small bucket instead of a linear sweep over every pattern. Bare
+        keywords ("mute", "help") go in an exact-match dict checked first,
+        and also into the verb table under themselves so phrasings like
+        "mute the volume" still dispatch on the anchored regex; patterns
+        without a literal leading word land in a fallthrough bucket.
+        """
+        self._exact = {}
+        self._verb_table = {}
+        self._fallthrough = []
+        for raw, compiled, handler in self._compiled:
+            if re.fullmatch(r'[a-z]+', raw):
+                self._exact[raw] = handler
+                self._verb_table.setdefault(raw, []).append(
+                    (compiled, handler))
+                continue
+            lead = re.match(r'([a-z]+)\\s', raw)
+            if lead:
+                self._verb_table.setdefault(lead.group(1), []).append(
+                    (compiled, handler))
+            else:
+                self._fallthrough.append((compiled, handler))
+
+    def preprocess_command(self, command):
+        """Strip filler words from an already-lowered command string."""
+        return " ".join(w for w in command.split() if w not in _FILLERS)
+
+    def process_command(self, command):
+        """Dispatch a command string to the first matching handler.
+
+        Convention: the command is lowered exactly once here and every
+        downstream consumer (patterns, intent analysis, basic responses)
+        works on the pre-lowered string.
+        """
+        self.spoke_response = False
+        command = self.preprocess_command(command.strip().lower())
+        if not command:
+            return "I didn't catch that, Sir."
+
+        handler = self._exact.get(command)
+        if handler:
+            return handler(None)
+
+        first = command.split(None, 1)[0]
+        for pattern, handler in self._verb_table.get(first, ()):
+            match = pattern.match(command)
+            if match:
+                return handler(match)
+
+        for pattern, handler in self._fallthrough:
+            match = pattern.match(command)
+            if match:
+                return handler(match)
+
+        return self.handle_general_query(command)
+
+    def add_custom_command(self, pattern, handler):
+        """Register an additional pattern at runtime."""
+        self.command_patterns[pattern] = handler
+        self._compiled.append(
+            (pattern, self._compile_anchored(pattern), handler))
+        self._build_dispatch()
+
+    def remove_custom_command(self, pattern):
+        """Remove a previously registered pattern."""
+        self.command_patterns.pop(pattern, None)
+        self._compiled = [
+            entry for entry in self._compiled if entry[0] != pattern
+        ]
+        self._build_dispatch()
+
+    # --- handlers -------------------------------------------------------
+
+    def handle_open_app(self, match):
+        app_name = match.group(1).strip()
+        result = self.system_controller.open_application(app_name)
+        # background=True: the canned ack goes out now and any LLM polish
+        # rides the cheap Batch lane instead of a blocking call.
+        return self.ai_assistant.generate_contextual_response(
+            app_name, result, background=True)
+
+    def handle_close_app(self, match):
+        app_name = match.group(1).strip()
+        result = self.system_controller.close_application(app_name)
+        return self.ai_assistant.generate_contextual_response(
+            app_name, result, background=True)
+
+    def handle_youtube(self, match):
+        query = match.group(1).strip()
+        self.system_controller.play_youtube_video(query)
+        return f"Playing {query} on YouTube, Sir."
+
+    def handle_play_music(self, match):
+        query = match.group(1).strip()
+        result = self.system_controller.find_and_play_music(query)
+        if result:
+            return f"Playing {query}, Sir."
+        return f"I couldn't find {query} in your music library, Sir."
+
+    def handle_search(self, match):
+        query = match.group(1).strip()
+        self.system_controller.search(query)
+        return f"Here's what I found for {query}, Sir."
+
+    def handle_time(self, match):
+        return f"The time is {time.strftime(_TIME_FMT, time.localtime())}, Sir."
+
+    def handle_date(self, match):
+        return f"Today is {time.strftime(_DATE_FMT, time.localtime())}, Sir."
+
+    def handle_volume_up(self, match):
+        self.system_controller.adjust_volume("up")
+        return "Volume increased, Sir."
+
+    def handle_volume_down(self, match):
+        self.system_controller.adjust_volume("down")
+        return "Volume decreased, Sir."
+
+    def handle_mute(self, match):
+        self.system_controller.adjust_volume("mute")
+        return "Muted, Sir."
+
+    def handle_screenshot(self, match):
+        path = self.system_controller.take_screenshot()
+        return f"Screenshot saved, Sir." if path else "Screenshot failed, Sir."
+
+    def handle_system_info(self, match):
+        info = self.system_controller.get_system_info()
+        return info or "I couldn't read the system status, Sir."
+
+    def handle_lock(self, match):
+        self.system_controller.lock_computer()
+        return "Locking the computer, Sir."
+
+    def handle_shutdown(self, match):
+        self.system_controller.shutdown_system()
+        return "Shutting down, Sir. Goodbye."
+
+    def handle_restart(self, match):
+        self.system_controller.restart_system()
+        return "Restarting, Sir."
+
+    def handle_greeting(self, match):
+        return "Hello Sir, how may I assist you?"
+
+    def handle_how_are_you(self, match):
+        return "All systems operational, Sir."
+
+    def handle_help(self, match):
+        return (
+            "You can ask me to open or close applications, play music or "
+            "YouTube videos, search the web, take screenshots, adjust the "
+            "volume, or answer questions, Sir."
+        )
+
+    def handle_goodbye(self, match):
+        return "Goodbye, Sir. Call me if you need anything."
+
+    def handle_general_query(self, command):
+        """Fall through to the LLM for anything without a pattern."""
+        if self.tts is None:
+            return self.ai_assistant.ask_question(command)
+
+        buffer = ""
+        spoken = []
+        for chunk in self.ai_assistant.ask_question_stream(command):
+            buffer += chunk
+            while True:
+                end = _SENTENCE_END.search(buffer)
+                if not end:
+                    break
+                sentence, buffer = buffer[:end.end()], buffer[end.end():]
+                self.tts.speak(sentence.strip())
+                spoken.append(sentence)
+        if buffer.strip():
+            self.tts.speak(buffer.strip())
+            spoken.append(buffer)
+        self.spoke_response = True
+        return "".join(spoken).strip()
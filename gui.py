@@ -0,0 +1,431 @@
+"""Tkinter dashboard for JARVIS.
+
+Shows live status, command/response history, and system metrics in a
+dark JARVIS-style control panel.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+
+try:
+    import psutil
+except ImportError:
+    # Placeholder metrics only; bound once here rather than imported
+    # inside the sampler every tick.
+    from random import randint
+    psutil = None
+
+
+class Metrics(NamedTuple):
+    """One slot per metric row, in display order.
+
+    Holds the value StringVars on the GUI side and, with the same field
+    order, the string snapshots produced by the sampler thread — so the
+    update path is a plain zip over three tuples with no string keys.
+    """
+
+    time: tk.StringVar
+    cpu: tk.StringVar
+    mem: tk.StringVar
+    disk: tk.StringVar
+    net: tk.StringVar
+    uptime: tk.StringVar
+
+
+class JarvisGUI:
+    """Dark-themed control panel showing status, history and system info."""
+
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("J.A.R.V.I.S.")
+        self.root.geometry("900x650")
+
+        self.colors = {
+            "bg": "#0a0a14",
+            "panel": "#12122a",
+            "primary": "#00d4ff",
+            "secondary": "#005f73",
+            "text": "#e0e0e0",
+        }
+        self.root.configure(bg=self.colors["bg"])
+
+        self.commands = deque(maxlen=50)
+        self.responses = deque(maxlen=50)
+        self.running = True
+        # Tracks map state so metric rendering can be skipped while the
+        # window is iconified; maintained by <Map>/<Unmap> bindings.
+        self._visible = True
+        # Signaled at shutdown so the updater thread wakes immediately
+        # instead of finishing its current sleep.
+        self._stop_event = threading.Event()
+
+        # Widget mutations happen only on the Tk main thread: the updater
+        # thread just computes metric snapshots and pushes them here, and a
+        # root.after() consumer applies the latest one per tick. The queue is
+        # tiny on purpose — if the GUI falls behind, stale snapshots are
+        # dropped rather than queued up.
+        self._update_queue = queue.Queue(maxsize=2)
+        # Last rendered text per metric, positionally aligned with
+        # Metrics; unchanged values skip the Tcl round-trip of
+        # label.config() entirely.
+        self._last_values = [None] * len(Metrics._fields)
+        self._last_net_bytes = 0
+
+        # History items are buffered and flushed in batches on idle, so a
+        # burst of commands/responses costs one widget reconfigure per flush
+        # instead of one per item.
+        self._pending_cmds = deque()
+        self._pending_resps = deque()
+        self._flush_scheduled = False
+        self._flush_batch_size = 250
+        self._resp_entries = 0
+        # Hard ceiling on Text widget lines. Entry-count eviction keeps
+        # parity with the responses deque, but a single multi-line
+        # response counts as one entry — this cap bounds actual Tcl
+        # memory regardless of entry shape.
+        self._resp_max_lines = 500
+
+        # The [HH:MM:SS] prefix is memoized per epoch second; bursty input
+        # reuses the cached string instead of re-running strftime per entry.
+        self._ts_second = -1
+        self._ts_str = ""
+
+        self.setup_styles()
+        self.create_gui()
+        self.start_update_thread()
+        self.root.after(1000, self._drain_and_reschedule)
+
+    def setup_styles(self):
+        """Configure ttk styles for the dark theme."""
+        style = ttk.Style(self.root)
+        try:
+            style.theme_use("clam")
+        except tk.TclError:
+            pass
+        style.configure(
+            "Jarvis.TFrame", background=self.colors["panel"])
+        # Hover recoloring via the style map runs inside Tk's own event
+        # dispatch — no Python callback per mouse crossing.
+        style.configure(
+            "Jarvis.TButton",
+            background=self.colors["primary"],
+            foreground=self.colors["bg"],
+            font=("Arial", 10, "bold"),
+            relief=tk.FLAT)
+        style.map(
+            "Jarvis.TButton",
+            background=[("active", self.colors["secondary"])])
+
+    def create_gui(self):
+        """Build all widgets."""
+        title = tk.Label(
+            self.root, text="J.A.R.V.I.S.",
+            font=("Arial", 24, "bold"),
+            fg=self.colors["primary"], bg=self.colors["bg"])
+        title.pack(pady=(10, 0))
+
+        self._status_var = tk.StringVar(value="Status: Online")
+        self.status_label = tk.Label(
+            self.root, textvariable=self._status_var,
+            font=("Arial", 12),
+            fg=self.colors["text"], bg=self.colors["bg"])
+        self.status_label.pack(pady=(0, 10))
+
+        self.root.bind("<Map>",
+                       lambda e: setattr(self, "_visible", True))
+        self.root.bind("<Unmap>",
+                       lambda e: setattr(self, "_visible", False))
+
+        body = tk.Frame(self.root, bg=self.colors["bg"])
+        body.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        left = tk.Frame(body, bg=self.colors["bg"])
+        left.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.system_info_frame = tk.Frame(body, bg=self.colors["panel"])
+        self.system_info_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
+        self.create_system_info_labels()
+
+        cmd_label = tk.Label(
+            left, text="Command History",
+            fg=self.colors["primary"], bg=self.colors["bg"])
+        cmd_label.pack(anchor=tk.W)
+        self.command_history = tk.Listbox(
+            left, height=8,
+            bg=self.colors["panel"], fg=self.colors["text"],
+            selectbackground=self.colors["secondary"])
+        self.command_history.pack(fill=tk.X, pady=(0, 10))
+
+        resp_label = tk.Label(
+            left, text="Responses",
+            fg=self.colors["primary"], bg=self.colors["bg"])
+        resp_label.pack(anchor=tk.W)
+        self.response_history = scrolledtext.ScrolledText(
+            left, height=12, state=tk.DISABLED, wrap=tk.WORD,
+            bg=self.colors["panel"], fg=self.colors["text"])
+        self.response_history.pack(fill=tk.BOTH, expand=True)
+
+        self.create_control_panel()
+
+    def create_system_info_labels(self):
+        """Lay the metrics out as one grid in the side panel.
+
+        A single container with gridded labels instead of a Frame plus two
+        packed Labels per row: a third fewer widgets and one geometry pass
+        for the whole panel rather than one per row.
+        """
+        header = tk.Label(
+            self.system_info_frame, text="System Status",
+            font=("Arial", 12, "bold"),
+            fg=self.colors["primary"], bg=self.colors["panel"])
+        header.grid(row=0, column=0, columnspan=2, pady=(10, 5), padx=10)
+
+        variables = []
+        for row, label_text in enumerate(
+                ("Time:", "CPU Usage:", "Memory:",
+                 "Disk:", "Network:", "Uptime:"), start=1):
+            name = tk.Label(
+                self.system_info_frame, text=label_text,
+                width=12, anchor=tk.W,
+                fg=self.colors["text"], bg=self.colors["panel"])
+            name.grid(row=row, column=0, sticky="w", padx=(10, 2), pady=2)
+            # textvariable instead of config(text=...): updates are a
+            # single Tcl variable write the widget observes, not a full
+            # option reparse per tick.
+            var = tk.StringVar(value="--")
+            value = tk.Label(
+                self.system_info_frame, textvariable=var, anchor=tk.W,
+                fg=self.colors["primary"], bg=self.colors["panel"])
+            value.grid(row=row, column=1, sticky="we", padx=(0, 10), pady=2)
+            variables.append(var)
+        self.system_info_frame.columnconfigure(1, weight=1)
+
+        # Direct attribute slots for the per-tick update path: no string
+        # hash or membership probe per metric per second.
+        self.metrics = Metrics(*variables)
+
+    def create_control_panel(self):
+        """Build the button row along the bottom."""
+        panel = tk.Frame(self.root, bg=self.colors["bg"])
+        panel.pack(fill=tk.X, padx=10, pady=10)
+
+        buttons = (
+            ("Clear", self.clear_displays),
+            ("Save Log", self.save_interaction_log),
+            ("Minimize", self.root.iconify),
+            ("Exit", self.close_application),
+        )
+        for text, command in buttons:
+            btn = ttk.Button(
+                panel, text=text, command=command, width=10,
+                style="Jarvis.TButton")
+            btn.pack(side=tk.LEFT, padx=5)
+
+    def start_update_thread(self):
+        """Run the metric sampler off the main thread.
+
+        The sampler never touches widgets; it only computes a snapshot dict
+        and offers it to the queue, dropping the snapshot if the GUI hasn't
+        consumed the previous one yet.
+        """
+        if psutil is not None:
+            # Prime the sampler so the first non-blocking call is real.
+            psutil.cpu_percent(interval=None)
+
+        def update_loop():
+            while self.running:
+                try:
+                    snapshot = self._sample_metrics()
+                    try:
+                        self._update_queue.put_nowait(snapshot)
+                    except queue.Full:
+                        pass
+                    if self._stop_event.wait(1.0):
+                        return
+                except Exception as e:
+                    print(f"Update thread error: {e}")
+                    if self._stop_event.wait(5.0):
+                        return
+
+        self.update_thread = threading.Thread(target=update_loop, daemon=True)
+        self.update_thread.start()
+
+    def _sample_metrics(self):
+        """Sample real system metrics, or placeholders without psutil."""
+        now = time.strftime("%H:%M:%S")
+        if psutil is None:
+            return Metrics(
+                time=now,
+                cpu=f"{randint(5, 60)}%",
+                mem=f"{randint(30, 80)}%",
+                disk=f"{randint(20, 70)}%",
+                net=f"{randint(0, 100)} KB/s",
+                uptime=f"{randint(1, 48)}h",
+            )
+
+        net = psutil.net_io_counters()
+        total = net.bytes_sent + net.bytes_recv
+        rate_kb = (total - self._last_net_bytes) / 1024.0 if self._last_net_bytes else 0.0
+        self._last_net_bytes = total
+        uptime_h = (time.time() - psutil.boot_time()) / 3600.0
+        return Metrics(
+            time=now,
+            cpu=f"{psutil.cpu_percent(interval=None):.0f}%",
+            mem=f"{psutil.virtual_memory().percent:.0f}%",
+            disk=f"{psutil.disk_usage('/').percent:.0f}%",
+            net=f"{rate_kb:.0f} KB/s",
+            uptime=f"{uptime_h:.1f}h",
+        )
+
+    def _drain_and_reschedule(self):
+        """Apply the freshest queued snapshot on the Tk main thread."""
+        snapshot = None
+        while True:
+            try:
+                snapshot = self._update_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        # The queue is always drained so it can't back up, but while the
+        # window is iconified nobody can see the labels — skip the Tcl
+        # writes entirely. _last_values keeps change-detection correct
+        # for the first visible tick after restore.
+        if snapshot and self._visible:
+            for i, (var, value) in enumerate(zip(self.metrics, snapshot)):
+                if value != self._last_values[i]:
+                    var.set(value)
+                    self._last_values[i] = value
+
+        if self.running:
+            self.root.after(1000, self._drain_and_reschedule)
+
+    def _now_ts(self):
+        """Timestamp string for log entries, cached per second."""
+        second = int(time.time())
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._ts_str
+
+    def add_command(self, command):
+        """Queue a recognized command for the history list.
+
+        Safe from any thread: only the deque append happens here; the
+        flush is marshaled onto the Tk main thread via after(0).
+        """
+        entry = f"[{self._now_ts()}] {command}"
+        self.commands.append(entry)
+        self._pending_cmds.append(entry)
+        self.root.after(0, self._schedule_flush)
+
+    def add_response(self, response):
+        """Queue a spoken response for the response pane.
+
+        Safe from any thread, like add_command.
+        """
+        entry = f"[{self._now_ts()}] {response}\n"
+        self.responses.append(entry)
+        self._pending_resps.append(entry)
+        self.root.after(0, self._schedule_flush)
+
+    def _schedule_flush(self):
+        """Arrange a single idle-time flush; runs on the Tk thread."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_pending)
+
+    def _flush_pending(self):
+        """Drain the pending buffers into the widgets in one batch each."""
+        self._flush_scheduled = False
+
+        batch = []
+        while self._pending_cmds and len(batch) < self._flush_batch_size:
+            batch.append(self._pending_cmds.popleft())
+        if batch:
+            self.command_history.insert(tk.END, *batch)
+            # Mirror the deque's maxlen on screen: evict from the front so
+            # the Listbox can't grow unbounded over a long session.
+            overflow = self.command_history.size() - self.commands.maxlen
+            if overflow > 0:
+                self.command_history.delete(0, overflow - 1)
+            self.command_history.see(tk.END)
+
+        batch = []
+        while self._pending_resps and len(batch) < self._flush_batch_size:
+            batch.append(self._pending_resps.popleft())
+        if batch:
+            self.response_history.config(state=tk.NORMAL)
+            self.response_history.insert(tk.END, "".join(batch))
+            self._resp_entries += len(batch)
+            while self._resp_entries > self.responses.maxlen:
+                self.response_history.delete("1.0", "2.0")
+                self._resp_entries -= 1
+            lines = int(
+                self.response_history.index("end-1c").split(".")[0])
+            if lines > self._resp_max_lines:
+                self.response_history.delete(
+                    "1.0", f"{lines - self._resp_max_lines}.0")
+            self.response_history.config(state=tk.DISABLED)
+            self.response_history.see(tk.END)
+
+        if self._pending_cmds or self._pending_resps:
+            self._schedule_flush()
+
+    def update_status(self, status):
+        """Update the status line under the title; safe from any thread."""
+        self.root.after(0, self._status_var.set, f"Status: {status}")
+
+    def clear_displays(self):
+        """Wipe both history widgets and their backing deques.
+
+        Callable from any thread; the widget work runs on the Tk thread.
+        """
+        self.commands.clear()
+        self.responses.clear()
+        self._pending_cmds.clear()
+        self._pending_resps.clear()
+        self.root.after(0, self._clear_widgets)
+
+    def _clear_widgets(self):
+        """Tk-thread half of clear_displays."""
+        self.command_history.delete(0, tk.END)
+        self.response_history.config(state=tk.NORMAL)
+        self.response_history.delete("1.0", tk.END)
+        self.response_history.config(state=tk.DISABLED)
+        self._resp_entries = 0
+
+    def save_interaction_log(self):
+        """Write the current histories to a log file."""
+        try:
+            parts = ["JARVIS Interaction Log\n", "=" * 50 + "\n\n",
+                     "Commands:\n"]
+            parts.extend(command + "\n" for command in self.commands)
+            parts.append("\nResponses:\n")
+            parts.extend(self.responses)
+            with open("jarvis_interactions.log", "w", encoding="utf-8") as f:
+                f.write("".join(parts))
+            self.update_status("Log saved")
+        except Exception as e:
+            print(f"Could not save log: {e}")
+            self.update_status("Log save failed")
+
+    def close_application(self):
+        """Stop the updater and tear down the window."""
+        self.running = False
+        self._stop_event.set()
+        self.root.quit()
+
+    def run(self):
+        """Enter the Tk main loop."""
+        self.root.mainloop()
+
+
+if __name__ == "__main__":
+    gui = JarvisGUI()
+    gui.run()
@@ -0,0 +1,222 @@
+"""JARVIS entry point: wires voice, AI, system control and the GUI.
+
+The assistant runs as an asyncio coroutine on a background thread while
+Tk owns the main thread. Blocking speech-recognition calls run in the
+default executor, so wake-word polling, TTS and LLM requests interleave
+instead of serializing on one loop.
+"""
+
+import asyncio
+import functools
+import logging
+import queue
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+
+from ai_integration import AIAssistant, CommandProcessor
+from gui import JarvisGUI
+from system_controller import SystemController
+from text_to_speech import TextToSpeech
+from voice_recognizer import VoiceRecognizer
+
+def _setup_logging():
+    """Route log records through a queue so the audio loop never blocks
+    on a disk write or stdout flush; a listener thread owns the real
+    handlers."""
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    file_handler = logging.FileHandler("jarvis.log")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    return listener
+
+
+_log_listener = _setup_logging()
+
+
+class JarvisAssistant:
+    """Owns all subsystems and the listen/act loop."""
+
+    def __init__(self):
+        self.logger = logging.getLogger("jarvis")
+        self.wake_word = "hey jarvis"
+        # Case-insensitive matcher compiled once: no per-utterance lowered
+        # copy of the transcript, and tolerant of "Hey,  Jarvis" spacing.
+        self._wake_re = re.compile(r"\bhey\s+jarvis\b", re.IGNORECASE)
+        self.running = False
+
+        # Components are constructed in parallel inside start(); the GUI
+        # renders immediately instead of waiting on the slowest of them.
+        self.voice_recognizer = None
+        self.tts = None
+        self.system_controller = None
+        self.ai_assistant = None
+        self.command_processor = None
+        self.gui = None
+        self._init_lock = threading.Lock()
+        self._pending_components = set()
+
+        # Recognized utterances flow capture thread -> main loop through
+        # this queue, so the microphone keeps recording while the loop is
+        # busy speaking or processing; nothing said during the "Yes sir?"
+        # prompt is dropped.
+        self._utterances = queue.Queue()
+
+    async def _speak(self, text):
+        """Queue speech without blocking the loop."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.tts.speak, text)
+
+    async def process_command(self, command):
+        """Run one recognized command and voice the result."""
+        self.gui.add_command(command)
+        self.gui.update_status("Processing...")
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            None, self.command_processor.process_command, command)
+        if response:
+            self.gui.add_response(response)
+            # General queries stream their sentences to TTS inside the
+            # processor; queueing the joined text again would speak the
+            # whole answer twice.
+            if not self.command_processor.spoke_response:
+                asyncio.create_task(self._speak(response))
+        self.gui.update_status("Listening")
+
+    def _capture_loop(self):
+        """Producer: keep the mic hot and queue every recognized utterance.
+
+        Capture never waits on the consumer, so speech that arrives while
+        the main loop is mid-TTS or mid-command is buffered, not lost.
+        """
+        while self.running:
+            try:
+                text = self.voice_recognizer.listen()
+                if text:
+                    self._utterances.put(text)
+            except Exception as e:
+                self.logger.error(f"Capture error: {e}")
+
+    def _next_utterance(self, timeout=1):
+        """Blocking-with-timeout queue read, run in the executor."""
+        try:
+            return self._utterances.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def main_loop(self):
+        """Consume utterances: wake word first, then the command."""
+        loop = asyncio.get_running_loop()
+        self.logger.info("JARVIS online")
+        while self.running:
+            try:
+                audio_text = await loop.run_in_executor(
+                    None, self._next_utterance)
+                if audio_text and self._wake_re.search(audio_text):
+                    self.logger.info("Wake word detected")
+                    # Fire-and-forget the prompt; the capture thread is
+                    # already recording the command underneath it.
+                    asyncio.create_task(self._speak("Yes sir?"))
+                    # The command only reaches the queue after the capture
+                    # thread sees end-of-speech (pause_threshold) and
+                    # finishes transcribing, so give it the same window the
+                    # old blocking listen(timeout=5) provided plus slack —
+                    # a 1s poll here would nearly always miss it.
+                    command = await loop.run_in_executor(
+                        None, functools.partial(self._next_utterance, 6))
+                    if command:
+                        self.logger.info(f"Command: {command}")
+                        await self.process_command(command)
+            except Exception as e:
+                self.logger.error(f"Main loop error: {e}")
+
+    def start(self):
+        """Bring everything up; Tk keeps the main thread.
+
+        The GUI is created first and shown immediately; the remaining
+        components initialize concurrently on a small pool, so perceived
+        startup is bounded by the slowest component instead of their sum.
+        """
+        self.running = True
+        self.gui = JarvisGUI()
+        self.gui.update_status("Initializing...")
+
+        components = {
+            "voice_recognizer": VoiceRecognizer,
+            "tts": TextToSpeech,
+            "system_controller": SystemController,
+            "ai_assistant": AIAssistant,
+        }
+        self._pending_components = set(components)
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        for attr, factory in components.items():
+            future = self._executor.submit(factory)
+            future.add_done_callback(
+                functools.partial(self._component_ready, attr))
+
+        self.gui.run()
+
+    def _component_ready(self, attr, future):
+        """Attach a finished component; start listening once all are up."""
+        try:
+            setattr(self, attr, future.result())
+        except Exception as e:
+            self.logger.error(f"Failed to initialize {attr}: {e}")
+            self.gui.root.after(
+                0, self.gui.update_status, f"Error starting {attr}")
+            return
+
+        self.gui.root.after(
+            0, self.gui.update_status, f"Initialized {attr}")
+        with self._init_lock:
+            self._pending_components.discard(attr)
+            ready = not self._pending_components
+        if ready:
+            self._finish_startup()
+
+    def _finish_startup(self):
+        """Wire components together and launch the listen loop."""
+        self.command_processor = CommandProcessor(
+            self.ai_assistant, self.system_controller, tts=self.tts)
+        self.tts.speak("Hello Sir, JARVIS at your service.")
+        self.gui.root.after(0, self.gui.update_status, "Listening")
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        self._loop_thread = threading.Thread(
+            target=lambda: asyncio.run(self.main_loop()), daemon=True)
+        self._loop_thread.start()
+
+    def shutdown(self):
+        """Stop the loop and tear down subsystems."""
+        self.logger.info("Shutting down")
+        self.running = False
+        if self.voice_recognizer:
+            self.voice_recognizer.stop_listening()
+        if self.ai_assistant:
+            # Submit any batch work still waiting below the flush threshold.
+            self.ai_assistant.flush_batch()
+        if self.tts:
+            self.tts.shutdown()
+        if self.gui:
+            self.gui.close_application()
+        _log_listener.stop()
+
+
+if __name__ == "__main__":
+    jarvis = JarvisAssistant()
+    try:
+        jarvis.start()
+    except KeyboardInterrupt:
+        jarvis.shutdown()
@@ -0,0 +1,738 @@
+"""System control for JARVIS: apps, files, media, volume, power."""
+
+import functools
+import json
+import os
+import glob
+import re
+import threading
+import time
+import platform
+import subprocess
+import webbrowser
+from urllib.parse import quote_plus
+from urllib.request import Request, urlopen
+
+#: First "videoId" in a YouTube results page — the top search hit.
+_VIDEO_ID_RE = re.compile(r'"videoId":"([^"]+)"')
+
+#: Directory names that never hold user files worth searching; pruning
+#: them skips whole subtrees (dependency caches can dwarf the rest of
+#: the home directory in entry count).
+SKIP_DIRS = frozenset({
+    "node_modules", "__pycache__", ".git", ".cache", ".venv", "venv",
+    "$recycle.bin", "appdata", "site-packages",
+})
+
+#: Spoken names and synonyms for each launchable app, keyed by the
+#: canonical name used in the app-path table.
+ALIAS_MAP = {
+    "chrome": ["chrome", "google chrome", "browser"],
+    "firefox": ["firefox", "mozilla"],
+    "edge": ["edge", "microsoft edge"],
+    "notepad": ["notepad", "text editor"],
+    "calculator": ["calculator", "calc"],
+    "paint": ["paint", "mspaint"],
+    "cmd": ["cmd", "command prompt", "terminal"],
+    "explorer": ["explorer", "file explorer", "files"],
+    "word": ["word", "microsoft word"],
+    "excel": ["excel", "microsoft excel", "spreadsheet"],
+    "vlc": ["vlc", "media player"],
+    "code": ["code", "vs code", "visual studio code"],
+    "spotify": ["spotify", "music player"],
+}
+
+
+class SystemController:
+    """Executes OS-level actions behind the voice commands."""
+
+    #: User-local cache directory for on-disk indexes.
+    CACHE_DIR = os.path.expanduser("~/.jarvis")
+
+    # psutil and pyautogui pull in native extensions (and, for
+    # pyautogui, Pillow and friends) costing hundreds of ms at import;
+    # they are loaded on first use so commands that never need them
+    # never pay for them.
+
+    @functools.cached_property
+    def _psutil(self):
+        import psutil
+        return psutil
+
+    @functools.cached_property
+    def _pyautogui(self):
+        import pyautogui
+        return pyautogui
+
+    @functools.cached_property
+    def _endpoint_volume(self):
+        """Cached IAudioEndpointVolume COM interface (Windows only).
+
+        One COM activation at first use; every later volume change is a
+        single sub-millisecond method call instead of spawning
+        PowerShell and JIT-compiling an Add-Type stub.
+        """
+        if self.system != "windows":
+            return None
+        try:
+            from comtypes import CLSCTX_ALL, cast, POINTER
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+            device = AudioUtilities.GetSpeakers()
+            interface = device.Activate(
+                IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+            return cast(interface, POINTER(IAudioEndpointVolume))
+        except Exception:
+            return None
+
+    @functools.cached_property
+    def _mss(self):
+        """Native screen grabber, or None if mss isn't installed."""
+        try:
+            import mss
+            import mss.tools
+            return mss
+        except ImportError:
+            return None
+
+    @functools.cached_property
+    def _turbojpeg(self):
+        """libjpeg-turbo encoder instance, or None if unavailable."""
+        try:
+            from turbojpeg import TurboJPEG
+            return TurboJPEG()
+        except Exception:
+            return None
+
+    def __init__(self):
+        self.system = platform.system().lower()
+        self.app_paths = self._get_common_app_paths()
+        # Start Menu shortcut index; built lazily on the first app-open
+        # miss rather than at construction.
+        self._app_index = None
+        # (timestamp, [(pid, name), ...]) — a short TTL absorbs bursts
+        # like "close chrome" / "close spotify" without re-enumerating
+        # every process for each command.
+        self._proc_cache = (0.0, [])
+        # Freshest CPU reading from the background sampler; the sampler
+        # starts on the first status query so construction stays free of
+        # the psutil import.
+        self._last_cpu = 0.0
+        self._cpu_sampler_started = False
+
+        # Per-OS behavior chosen once here: the public methods make one
+        # indirect call or Popen instead of re-comparing platform
+        # strings on every invocation.
+        if self.system == "windows":
+            self._open_path_impl = os.startfile
+            self._lock_argv = ["rundll32.exe", "user32.dll,LockWorkStation"]
+            self._shutdown_argv = ["shutdown", "/s", "/t", "1"]
+            self._restart_argv = ["shutdown", "/r", "/t", "1"]
+        elif self.system == "darwin":
+            self._open_path_impl = (
+                lambda p: self._launch_detached(["open", p]))
+            self._lock_argv = ["pmset", "displaysleepnow"]
+            self._shutdown_argv = ["sudo", "shutdown", "-h", "now"]
+            self._restart_argv = ["sudo", "shutdown", "-r", "now"]
+        else:
+            self._open_path_impl = (
+                lambda p: self._launch_detached(["xdg-open", p]))
+            self._lock_argv = ["loginctl", "lock-session"]
+            self._shutdown_argv = ["sudo", "shutdown", "-h", "now"]
+            self._restart_argv = ["sudo", "shutdown", "-r", "now"]
+
+        # Invariant paths resolved once; find_and_play_music previously
+        # re-expanded them (env lookups and stats) on every request.
+        self._home = os.path.expanduser("~")
+        self._music_dirs = [
+            d for d in (
+                os.path.join(self._home, "Music"),
+                os.path.join(self._home, "Downloads"),
+                rf"C:\Users\{os.getenv('USERNAME', '')}\Music",
+            )
+            if os.path.isdir(d)
+        ]
+
+        self.music_extensions = ['.mp3', '.wav', '.flac', '.m4a',
+                                 '.ogg', '.wma', '.aac']
+        self.video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv']
+        # Derived once: O(1) membership for single-extension checks and
+        # a tuple for endswith(), which loops over suffixes in C — both
+        # matter when called per file from the music-scan inner loop.
+        self._music_ext_set = frozenset(self.music_extensions)
+        self._video_ext_set = frozenset(self.video_extensions)
+        self._music_suffixes = tuple(self.music_extensions)
+
+        # Inverted alias index: exact phrases resolve with one dict
+        # probe; loose phrasing ("open up google chrome please") falls
+        # back to a single compiled alternation, longest aliases first
+        # so "vs code" wins over "code".
+        self._alias_to_canonical = {
+            alias: canonical
+            for canonical, aliases in ALIAS_MAP.items()
+            for alias in aliases
+        }
+        self._alias_re = re.compile("|".join(
+            re.escape(alias) for alias in
+            sorted(self._alias_to_canonical, key=len, reverse=True)))
+        # Resolution is a pure function of the spoken phrase given the
+        # tables above, so repeat commands ("open chrome" again) hit a
+        # per-instance LRU instead of re-running the regex scan.
+        self._resolve_app_command = functools.lru_cache(maxsize=128)(
+            self._resolve_app_command_uncached)
+
+    def _get_common_app_paths(self):
+        """Resolve well-known app paths, memoized on disk.
+
+        The full probe stats dozens of candidate locations; on warm
+        starts we instead load ~/.jarvis/app_paths.json and re-verify
+        each cached path with a single exists() (catches uninstalls at
+        one stat per app). A failed verification or unreadable cache
+        falls back to the full probe, which rewrites the cache.
+        """
+        if self.system != "windows":
+            return {}
+
+        cache_file = os.path.join(self.CACHE_DIR, "app_paths.json")
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            if (cached.get("user") == os.getenv("USERNAME", "")
+                    and all(os.path.exists(p)
+                            for p in cached["paths"].values())):
+                return cached["paths"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        paths = self._probe_app_paths()
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"user": os.getenv("USERNAME", ""), "paths": paths}, f)
+        except OSError as e:
+            print(f"App path cache error: {e}")
+        return paths
+
+    def _probe_app_paths(self):
+        """Probe well-known install locations for popular apps."""
+        paths = {}
+        username = os.getenv('USERNAME', '')
+        candidates = {
+            "chrome": [
+                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+            ],
+            "firefox": [
+                r"C:\Program Files\Mozilla Firefox\firefox.exe",
+                r"C:\Program Files (x86)\Mozilla Firefox\firefox.exe",
+            ],
+            "edge": [
+                r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+            ],
+            "notepad": [r"C:\Windows\System32\notepad.exe"],
+            "calculator": [r"C:\Windows\System32\calc.exe"],
+            "paint": [r"C:\Windows\System32\mspaint.exe"],
+            "cmd": [r"C:\Windows\System32\cmd.exe"],
+            "explorer": [r"C:\Windows\explorer.exe"],
+            "word": [
+                r"C:\Program Files\Microsoft Office\root\Office16\WINWORD.EXE",
+            ],
+            "excel": [
+                r"C:\Program Files\Microsoft Office\root\Office16\EXCEL.EXE",
+            ],
+            "vlc": [
+                r"C:\Program Files\VideoLAN\VLC\vlc.exe",
+                r"C:\Program Files (x86)\VideoLAN\VLC\vlc.exe",
+            ],
+            "code": [
+                rf"C:\Users\{username}\AppData\Local\Programs"
+                r"\Microsoft VS Code\Code.exe",
+            ],
+        }
+        for name, options in candidates.items():
+            for option in options:
+                if os.path.exists(option):
+                    paths[name] = option
+                    break
+
+        spotify_matches = glob.glob(
+            rf"C:\Users\{username}\AppData\Roaming\Spotify\Spotify.exe")
+        if spotify_matches:
+            paths["spotify"] = spotify_matches[0]
+        return paths
+
+    def _resolve_app_command_uncached(self, app_name):
+        """Map a normalized spoken phrase to (canonical, path), or None."""
+        canonical = self._alias_to_canonical.get(app_name)
+        if canonical is None:
+            match = self._alias_re.search(app_name)
+            if match:
+                canonical = self._alias_to_canonical[match.group(0)]
+        if canonical and canonical in self.app_paths:
+            return canonical, self.app_paths[canonical]
+        return None
+
+    def open_application(self, app_name):
+        """Open an application by (fuzzy) name."""
+        app_name = app_name.lower().strip()
+
+        resolved = self._resolve_app_command(app_name)
+        if resolved is not None:
+            canonical, path = resolved
+            try:
+                subprocess.Popen([path])
+                return f"Opened {canonical}"
+            except Exception as e:
+                print(f"Open error: {e}")
+                return None
+
+        return self._find_and_open_app(app_name)
+
+    def _start_menu_dirs(self):
+        """The two Start Menu roots that index installed applications."""
+        return [
+            os.path.join(
+                os.getenv("PROGRAMDATA", r"C:\ProgramData"),
+                r"Microsoft\Windows\Start Menu\Programs"),
+            os.path.join(
+                os.getenv("APPDATA", ""),
+                r"Microsoft\Windows\Start Menu\Programs"),
+        ]
+
+    @staticmethod
+    def _scan_shortcuts(root, max_depth=3):
+        """Yield .lnk paths under root via scandir, bounded in depth."""
+        stack = [(root, 0)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if depth < max_depth:
+                                stack.append((entry.path, depth + 1))
+                        elif entry.name.lower().endswith(".lnk"):
+                            yield entry.path
+            except OSError:
+                continue
+
+    def _build_app_index(self):
+        """Map app names to launch targets from Start Menu shortcuts.
+
+        The Start Menu trees already index installed apps in a few
+        hundred .lnk files, so enumerating them beats walking all of
+        Program Files by orders of magnitude. The result is persisted to
+        ~/.jarvis/app_index.json and reused until a Start Menu root's
+        mtime changes (an install or uninstall touches it).
+        """
+        cache_file = os.path.join(self.CACHE_DIR, "app_index.json")
+        roots = [d for d in self._start_menu_dirs() if os.path.isdir(d)]
+        newest = max((os.stat(d).st_mtime for d in roots), default=0.0)
+
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("mtime") == newest:
+                return cached["apps"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        # Resolve shortcut targets when pywin32 is available; otherwise
+        # the .lnk itself still launches fine through os.startfile.
+        shell = None
+        try:
+            import win32com.client
+            shell = win32com.client.Dispatch("WScript.Shell")
+        except Exception:
+            pass
+
+        apps = {}
+        for root in roots:
+            for lnk in self._scan_shortcuts(root):
+                name = os.path.splitext(os.path.basename(lnk))[0].lower()
+                target = lnk
+                if shell is not None:
+                    try:
+                        resolved = shell.CreateShortcut(lnk).TargetPath
+                        if resolved and os.path.exists(resolved):
+                            target = resolved
+                    except Exception:
+                        pass
+                apps.setdefault(name, target)
+
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({"mtime": newest, "apps": apps}, f)
+        except OSError as e:
+            print(f"App index cache error: {e}")
+        return apps
+
+    @staticmethod
+    def _app_paths_registry_lookup(app_name):
+        """Resolve an executable via the App Paths registry keys.
+
+        Installed apps register themselves under App Paths, and the
+        registry lookup is O(1) against a kernel-indexed store — always
+        worth trying before any filesystem enumeration.
+        """
+        import winreg
+        subkey = (r"SOFTWARE\Microsoft\Windows\CurrentVersion"
+                  rf"\App Paths\{app_name}.exe")
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, subkey) as key:
+                    path, _ = winreg.QueryValueEx(key, None)
+                if path:
+                    return path.strip('"')
+            except OSError:
+                continue
+        return None
+
+    def _find_and_open_app(self, app_name):
+        """Launch an app by name: App Paths registry, then the index."""
+        if self.system != "windows":
+            try:
+                subprocess.Popen([app_name])
+                return f"Opened {app_name}"
+            except Exception:
+                return None
+
+        registered = self._app_paths_registry_lookup(app_name)
+        if registered:
+            try:
+                subprocess.Popen([registered])
+                return f"Opened {app_name}"
+            except OSError:
+                pass
+
+        if self._app_index is None:
+            self._app_index = self._build_app_index()
+
+        for name, target in self._app_index.items():
+            if app_name in name:
+                try:
+                    # startfile handles both .lnk shortcuts and plain
+                    # executables.
+                    os.startfile(target)
+                    return f"Opened {name}"
+                except OSError:
+                    continue
+        return None
+
+    def _list_processes(self):
+        """Return (pid, name) pairs, cached for 500ms."""
+        stamp, procs = self._proc_cache
+        if time.monotonic() - stamp < 0.5:
+            return procs
+        procs = [
+            (proc.info['pid'], proc.info['name'] or "")
+            for proc in self._psutil.process_iter(['pid', 'name'])
+        ]
+        self._proc_cache = (time.monotonic(), procs)
+        return procs
+
+    def close_application(self, app_name):
+        """Terminate processes whose name matches, killing stragglers.
+
+        All matches get SIGTERM first, then one wait_procs() covers the
+        whole batch (a browser can own dozens of helper processes);
+        anything still alive after two seconds is killed outright.
+        """
+        app_name = app_name.lower().strip()
+        psutil = self._psutil
+        procs = []
+        closed = []
+        try:
+            for pid, name in self._list_processes():
+                if app_name in name.lower():
+                    try:
+                        proc = psutil.Process(pid)
+                        proc.terminate()
+                        procs.append(proc)
+                        closed.append(name)
+                    except psutil.NoSuchProcess:
+                        continue
+            if procs:
+                gone, alive = psutil.wait_procs(procs, timeout=2)
+                for proc in alive:
+                    try:
+                        proc.kill()
+                    except psutil.NoSuchProcess:
+                        continue
+        except Exception as e:
+            print(f"Close error: {e}")
+        if closed:
+            return f"Closed {', '.join(set(closed))}"
+        return None
+
+    @staticmethod
+    def _launch_detached(argv):
+        """Spawn a launcher without waiting for it.
+
+        xdg-open/open can take seconds on some desktops; blocking on
+        them held up the assistant's confirmation. Detach the session
+        and discard output so the child never ties us to its lifetime.
+        """
+        subprocess.Popen(
+            argv, start_new_session=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def open_file(self, file_path):
+        """Open a file with its default application."""
+        try:
+            self._open_path_impl(file_path)
+            return True
+        except Exception as e:
+            print(f"Open file error: {e}")
+            return False
+
+    def open_folder(self, folder_path):
+        """Open a folder in the system file manager."""
+        try:
+            self._open_path_impl(folder_path)
+            return True
+        except Exception as e:
+            print(f"Open folder error: {e}")
+            return False
+
+    def play_media(self, file_path):
+        """Open a media file if its extension is recognized."""
+        file_ext = os.path.splitext(file_path)[1].lower()
+        if (file_ext in self._music_ext_set
+                or file_ext in self._video_ext_set):
+            return self.open_file(file_path)
+        return False
+
+    @staticmethod
+    def _iter_files(root):
+        """Yield file entries under root depth-first via scandir.
+
+        Lazy by construction: callers that stop after the first match or
+        the tenth result never pay for the rest of the tree, unlike a
+        recursive glob that materializes every match up front.
+        """
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        else:
+                            yield entry
+            except OSError:
+                continue
+
+    def find_and_play_music(self, search_term):
+        """Find the first matching track in the usual music folders."""
+        search_term = search_term.lower()
+        extensions = self._music_suffixes
+        for music_dir in self._music_dirs:
+            # One traversal checking name and extension together, instead
+            # of a recursive glob per extension over the same tree.
+            for entry in self._iter_files(music_dir):
+                name = entry.name.lower()
+                if search_term in name and name.endswith(extensions):
+                    return self.play_media(entry.path)
+        return False
+
+    def search_files(self, pattern):
+        """Find up to ten files under home matching the pattern."""
+        results = []
+        pattern = pattern.lower()
+        try:
+            for entry in self._iter_files(self._home):
+                if pattern in entry.name.lower():
+                    results.append(entry.path)
+                    if len(results) >= 10:
+                        break
+        except Exception as e:
+            print(f"Search error: {e}")
+        return results
+
+    def search(self, query):
+        """Google the query in the default browser."""
+        search_url = ("https://www.google.com/search?q="
+                      + quote_plus(query))
+        webbrowser.open(search_url)
+        return True
+
+    def play_youtube_video(self, query):
+        """Open the top YouTube result for the query directly.
+
+        Fetches the results page and deep-links the first videoId,
+        instead of opening the search page, sleeping three seconds and
+        clicking a hardcoded pixel — faster and not layout-dependent.
+        Falls back to the plain results page if the fetch fails.
+        """
+        search_url = ("https://www.youtube.com/results?search_query="
+                      + quote_plus(query))
+        try:
+            request = Request(
+                search_url, headers={"User-Agent": "Mozilla/5.0"})
+            with urlopen(request, timeout=5) as response:
+                page = response.read().decode("utf-8", errors="replace")
+            match = _VIDEO_ID_RE.search(page)
+            if match:
+                webbrowser.open(
+                    f"https://www.youtube.com/watch?v={match.group(1)}")
+                return True
+        except Exception as e:
+            print(f"YouTube lookup error: {e}")
+        webbrowser.open(search_url)
+        return True
+
+    def take_screenshot(self, filename=None):
+        """Capture the screen to an image file.
+
+        Prefers mss (direct native capture, no Pillow round-trip); .jpg
+        output additionally uses libjpeg-turbo's SIMD encoder when
+        installed, which is several times faster than a zlib PNG encode
+        on large screens. Falls back to pyautogui when mss is absent.
+        """
+        if filename is None:
+            filename = f"screenshot_{int(time.time())}.png"
+        try:
+            if self._mss is not None:
+                with self._mss.mss() as grabber:
+                    shot = grabber.grab(grabber.monitors[0])
+                if (filename.lower().endswith((".jpg", ".jpeg"))
+                        and self._turbojpeg is not None):
+                    import numpy
+                    pixels = numpy.frombuffer(
+                        shot.bgra, dtype=numpy.uint8)
+                    pixels = pixels.reshape(
+                        shot.height, shot.width, 4)[:, :, :3]
+                    with open(filename, "wb") as f:
+                        f.write(self._turbojpeg.encode(pixels))
+                else:
+                    self._mss.tools.to_png(
+                        shot.rgb, shot.size, output=filename)
+            else:
+                self._pyautogui.screenshot().save(filename)
+            return filename
+        except Exception as e:
+            print(f"Screenshot error: {e}")
+            return None
+
+    def adjust_volume(self, direction):
+        """Raise, lower, or mute the master volume."""
+        try:
+            if self.system == "windows" and self._endpoint_volume is not None:
+                endpoint = self._endpoint_volume
+                if direction == "mute":
+                    endpoint.SetMute(not endpoint.GetMute(), None)
+                else:
+                    delta = 0.05 if direction == "up" else -0.05
+                    level = endpoint.GetMasterVolumeLevelScalar() + delta
+                    endpoint.SetMasterVolumeLevelScalar(
+                        min(1.0, max(0.0, level)), None)
+            elif self.system == "windows":
+                key_code = {"up": 175, "down": 174, "mute": 173}[direction]
+                script = (
+                    'Add-Type -TypeDefinition \''
+                    'using System;'
+                    'using System.Runtime.InteropServices;'
+                    'public class V {'
+                    '[DllImport("user32.dll")]'
+                    'public static extern IntPtr SendMessageW('
+                    'IntPtr hWnd, int Msg, IntPtr wParam, IntPtr lParam);}'
+                    '\'; '
+                    '[V]::SendMessageW(0xffff, 0x319, 0, '
+                    f'{key_code} * 65536)'
+                )
+                result = subprocess.run(
+                    ["powershell", "-Command", script], capture_output=True)
+                if result.returncode != 0:
+                    self._adjust_volume_vbs(direction)
+            elif self.system == "darwin":
+                delta = {"up": 10, "down": -10}.get(direction)
+                if delta is None:
+                    subprocess.run(
+                        ["osascript", "-e", "set volume output muted true"])
+                else:
+                    subprocess.run([
+                        "osascript", "-e",
+                        f"set volume output volume "
+                        f"((output volume of (get volume settings)) + {delta})",
+                    ])
+            else:
+                action = {"up": "5%+", "down": "5%-",
+                          "mute": "toggle"}[direction]
+                subprocess.run(["amixer", "-q", "set", "Master", action])
+            return True
+        except Exception as e:
+            print(f"Volume error: {e}")
+            return False
+
+    @functools.cached_property
+    def _volume_vbs(self):
+        """Reusable volume-key script in the temp dir, written once.
+
+        The key code comes in as a script argument, so one file covers
+        up/down/mute and the hot path does no disk IO at all — the old
+        version wrote, ran and deleted a script in the CWD per call.
+        """
+        import tempfile
+        script = ('Set WshShell = CreateObject("WScript.Shell")\n'
+                  'For i = 1 To 5\n'
+                  'WshShell.SendKeys chr(WScript.Arguments(0))\n'
+                  'Next\n')
+        path = os.path.join(tempfile.gettempdir(), "jarvis_volume.vbs")
+        with open(path, "w") as f:
+            f.write(script)
+        return path
+
+    def _adjust_volume_vbs(self, direction):
+        """Windows fallback: synthesize volume key presses via VBScript."""
+        key = {"up": 175, "down": 174, "mute": 173}[direction]
+        subprocess.run(["cscript", "//nologo", self._volume_vbs, str(key)])
+
+    def _start_cpu_sampler(self):
+        """Keep a rolling CPU reading so status queries never block.
+
+        cpu_percent(interval=1) sleeps a full second per call; the
+        sampler pays that cost continuously off-thread and status
+        queries just read the latest value.
+        """
+        if self._cpu_sampler_started:
+            return
+        self._cpu_sampler_started = True
+        psutil = self._psutil
+
+        def _sample_loop():
+            while True:
+                self._last_cpu = psutil.cpu_percent(interval=0.5)
+
+        threading.Thread(target=_sample_loop, daemon=True).start()
+
+    def get_system_info(self):
+        """Return a short spoken-friendly system status string."""
+        try:
+            self._start_cpu_sampler()
+            cpu = self._last_cpu
+            memory = self._psutil.virtual_memory().percent
+            disk = self._psutil.disk_usage('/').percent
+            return (f"CPU at {cpu:.0f} percent, memory at {memory:.0f} "
+                    f"percent, disk at {disk:.0f} percent.")
+        except Exception as e:
+            print(f"System info error: {e}")
+            return None
+
+    def lock_computer(self):
+        """Lock the workstation."""
+        subprocess.Popen(self._lock_argv)
+        return True
+
+    def shutdown_system(self):
+        """Power off the machine."""
+        subprocess.Popen(self._shutdown_argv)
+        return True
+
+    def restart_system(self):
+        """Reboot the machine."""
+        subprocess.Popen(self._restart_argv)
+        return True
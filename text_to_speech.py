@@ -0,0 +1,422 @@
+"""Text-to-speech output for JARVIS, built on pyttsx3."""
+
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import deque
+
+import pyttsx3
+
+
+class TextToSpeech:
+    """Speaks queued text through a render/playback thread pipeline."""
+
+    #: Sentence boundaries (and newlines) — long replies are queued
+    #: sentence-by-sentence so audio starts after the first sentence
+    #: is synthesized, not after the whole paragraph.
+    _SENTENCE_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+
+    #: Pre-rendered WAVs for recurring phrases, persistent across runs.
+    CACHE_DIR = os.path.expanduser("~/.jarvis/tts_cache")
+
+    #: Only short phrases ("Yes sir?", status prompts) recur enough to
+    #: be worth caching; long replies are unique and spoken live.
+    _CACHE_MAX_CHARS = 80
+
+    #: Cache size bound — oldest entries are evicted past this count.
+    _CACHE_MAX_FILES = 256
+
+    #: Adjacent short sentences are folded into chunks up to this many
+    #: characters, so "Done. Anything else?" renders as one utterance
+    #: instead of two tiny WAVs with an audible seam between them.
+    _FOLD_CHARS = 80
+
+    def __init__(self):
+        # The engine is created by the worker thread, not here: the
+        # SAPI5 driver is COM-apartment bound, and driving an engine
+        # from a thread other than its creator is the documented cause
+        # of pyttsx3's runAndWait freeze.
+        self.engine = None
+        self._engine_ready = threading.Event()
+
+        # Installed voices, enumerated once by the render worker: on
+        # SAPI5 getProperty('voices') is a COM round-trip that walks
+        # the registry every call.
+        self._voices = []
+        # Current synthesis parameters, mirrored here so cache keys can
+        # be computed without a cross-thread getProperty round-trip.
+        self._voice_id = ""
+        self._rate = 180
+        self._volume = 0.9
+        # Last values actually written to the engine; lets _set skip
+        # redundant setProperty COM round-trips.
+        self._props = {"voice": None, "rate": None, "volume": None}
+        # Serializes engine renders between the render worker and the
+        # occasional direct save_to_file caller.
+        self._engine_lock = threading.Lock()
+        # Renderer subprocess, spawned lazily on first render; False
+        # marks "tried and unavailable" so we probe only once.
+        self._render_proc = None
+        # Native CLI synthesizer name, probed once on first render.
+        self._native_tts = None
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+
+        self.speaking = False
+        self.running = True
+        # Single producer, single consumer: deque append/popleft are
+        # atomic under the GIL, so no lock or condition variable is
+        # paid per sentence — the Event only wakes an idle worker.
+        self._ring = deque(maxlen=256)
+        # Priority lane: prompts like "Yes sir?" jump ahead of queued
+        # reply sentences without discarding them.
+        self._prio = deque(maxlen=64)
+        self._wake = threading.Event()
+        # Rendered WAVs flow render worker -> playback worker here; the
+        # small bound is the double-buffer: synthesis runs at most a few
+        # sentences ahead of the speaker, overlapping the CPU-bound
+        # render of N+1 with the playback of N.
+        self._play_q = queue.Queue(maxsize=4)
+        # Player child currently sounding a WAV (afplay/aplay), so
+        # stop_speaking can terminate it mid-utterance.
+        self._player = None
+        self.render_thread = threading.Thread(
+            target=self._render_worker, daemon=True)
+        self.play_thread = threading.Thread(
+            target=self._play_worker, daemon=True)
+        self.render_thread.start()
+        self.play_thread.start()
+        self._engine_ready.wait(timeout=5)
+
+    def _set(self, key, value):
+        """setProperty, skipping writes the engine already holds.
+
+        Every setProperty is a COM round-trip on SAPI5, so repeated
+        writes of an unchanged rate or volume are pure overhead.
+        """
+        if self._props[key] == value:
+            return
+        self.engine.setProperty(key, value)
+        self._props[key] = value
+
+    def setup_voice(self):
+        """Pick an English voice and sane defaults."""
+        try:
+            self._voices = self.engine.getProperty('voices') or []
+            for voice in self._voices:
+                if "english" in voice.name.lower():
+                    self._set('voice', voice.id)
+                    self._voice_id = voice.id
+                    break
+            self._set('rate', 180)
+            self._set('volume', 0.9)
+        except Exception as e:
+            print(f"Voice setup error: {e}")
+
+    def _render_worker(self):
+        """Own the engine; turn queued sentences into WAVs.
+
+        save_to_file + runAndWait on the engine's own creator thread is
+        the safe pyttsx3 pattern; playback happens on the sibling
+        thread, so sentence N+1 renders while N is still sounding.
+        """
+        self.engine = pyttsx3.init()
+        self.setup_voice()
+        self._engine_ready.set()
+
+        while self.running:
+            if self._prio:
+                text = self._prio.popleft()
+            elif self._ring:
+                text = self._ring.popleft()
+            else:
+                # Idle: park on the event instead of spinning; the
+                # timeout keeps shutdown responsive.
+                self._wake.wait(timeout=0.5)
+                self._wake.clear()
+                continue
+            try:
+                cacheable = len(text) <= self._CACHE_MAX_CHARS
+                if cacheable:
+                    path = self._cache_path(text)
+                    if not os.path.exists(path):
+                        self._render(text, path)
+                        self._evict_cache()
+                else:
+                    fd, path = tempfile.mkstemp(suffix=".wav")
+                    os.close(fd)
+                    self._render(text, path)
+                self._play_q.put((path, not cacheable))
+            except (OSError, RuntimeError) as e:
+                print(f"Speech error: {e}")
+
+    def _get_native_tts(self):
+        """Name of a native CLI synthesizer, or None.
+
+        espeak-ng (Linux) and say (macOS) write a WAV straight from
+        the command line, keeping pyttsx3's driver event loop out of
+        the hot path entirely; Windows has no equivalent CLI, so SAPI5
+        keeps going through the engine there.
+        """
+        if self._native_tts is None:
+            self._native_tts = False
+            if sys.platform.startswith("linux") and shutil.which("espeak-ng"):
+                self._native_tts = "espeak-ng"
+            elif sys.platform == "darwin" and shutil.which("say"):
+                self._native_tts = "say"
+        return self._native_tts or None
+
+    def _render_native(self, text, path):
+        """Try rendering with the OS synthesizer; True on success."""
+        tool = self._get_native_tts()
+        if tool is None:
+            return False
+        if tool == "espeak-ng":
+            argv = ["espeak-ng", "-s", str(self._rate),
+                    "-a", str(int(self._volume * 200)), "-w", path, text]
+        else:
+            argv = ["say", "-r", str(self._rate), "-o", path,
+                    "--data-format=LEI16@22050", text]
+        try:
+            result = subprocess.run(argv, capture_output=True)
+            return result.returncode == 0 and os.path.exists(path)
+        except OSError:
+            self._native_tts = False
+            return False
+
+    def _get_render_proc(self):
+        """The tts_worker child process, spawned on first use.
+
+        Synthesis in a separate process keeps runAndWait's native busy
+        time off this process's GIL and isolates SAPI5 COM state; any
+        spawn failure falls back to the in-process engine for good.
+        """
+        if self._render_proc is None:
+            self._render_proc = False
+            worker = os.path.join(
+                os.path.dirname(os.path.abspath(__file__)), "tts_worker.py")
+            try:
+                self._render_proc = subprocess.Popen(
+                    [sys.executable, worker],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    text=True)
+            except OSError as e:
+                print(f"TTS worker spawn error: {e}")
+        return self._render_proc or None
+
+    def _render(self, text, path):
+        """Synthesize one sentence to a WAV file."""
+        if self._render_native(text, path):
+            return
+        proc = self._get_render_proc()
+        if proc is not None:
+            request = json.dumps({
+                "text": text, "path": path, "voice": self._voice_id,
+                "rate": self._rate, "volume": self._volume,
+            })
+            try:
+                with self._engine_lock:
+                    proc.stdin.write(request + "\n")
+                    proc.stdin.flush()
+                    reply = proc.stdout.readline().strip()
+                if reply == "ok" and os.path.exists(path):
+                    return
+            except (OSError, ValueError):
+                # Broken pipe: the worker died; stop probing it.
+                self._render_proc = False
+        with self._engine_lock:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+
+    def _play_worker(self):
+        """Play rendered WAVs in order, deleting one-shot temp files."""
+        while self.running:
+            try:
+                path, is_temp = self._play_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.speaking = True
+            self._play_wav(path)
+            self.speaking = False
+            if is_temp:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _cache_path(self, text):
+        """WAV cache location for text under the current voice settings."""
+        key = hashlib.sha1(
+            f"{self._voice_id}|{self._rate}|{self._volume}|{text}"
+            .encode()).hexdigest()
+        return os.path.join(self.CACHE_DIR, f"{key}.wav")
+
+    def _evict_cache(self):
+        """Drop the oldest cached WAVs past the size bound."""
+        try:
+            entries = [
+                (e.stat().st_mtime, e.path)
+                for e in os.scandir(self.CACHE_DIR)
+                if e.name.endswith(".wav")
+            ]
+            if len(entries) > self._CACHE_MAX_FILES:
+                entries.sort()
+                for _, path in entries[:len(entries)
+                                       - self._CACHE_MAX_FILES]:
+                    os.unlink(path)
+        except OSError:
+            pass
+
+    def _play_wav(self, path):
+        """Blocking playback of a rendered WAV."""
+        try:
+            if sys.platform == "win32":
+                import winsound
+                winsound.PlaySound(path, winsound.SND_FILENAME)
+            else:
+                argv = (["afplay", path] if sys.platform == "darwin"
+                        else ["aplay", "-q", path])
+                self._player = subprocess.Popen(argv)
+                self._player.wait()
+                self._player = None
+        except (OSError, RuntimeError) as e:
+            print(f"Playback error: {e}")
+
+    @classmethod
+    def _split_sentences(cls, text):
+        """Split text at sentence boundaries, folding short fragments.
+
+        Units small enough that audio starts after the first sentence,
+        but not so small that every clause becomes its own render.
+        """
+        chunks = []
+        current = ""
+        for sentence in cls._SENTENCE_RE.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if current and len(current) + len(sentence) + 1 <= cls._FOLD_CHARS:
+                current = f"{current} {sentence}"
+            else:
+                if current:
+                    chunks.append(current)
+                current = sentence
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def speak(self, text, priority=False):
+        """Queue text to be spoken; priority text jumps the queue.
+
+        Priority utterances go through a separate lane the render
+        worker drains first, so they cut ahead of a long queued reply
+        without throwing the rest of it away.
+        """
+        if not text:
+            return
+        lane = self._prio if priority else self._ring
+        lane.extend(self._split_sentences(text))
+        self._wake.set()
+
+    def speak_immediately(self, text):
+        """Drop everything queued and speak this next.
+
+        Pending sentences are discarded; the current sentence finishes
+        (playback is per-sentence, so the wait is short) and this text
+        renders next.
+        """
+        self.clear_queue()
+        self._prio.append(text)
+        self._wake.set()
+
+    def clear_queue(self):
+        """Discard all queued utterances: both text lanes and any WAVs
+        already rendered but not yet played."""
+        self._prio.clear()
+        self._ring.clear()
+        while True:
+            try:
+                path, is_temp = self._play_q.get_nowait()
+            except queue.Empty:
+                break
+            if is_temp:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def stop_speaking(self):
+        """Interrupt the current utterance and drop the backlog."""
+        self.clear_queue()
+        if sys.platform == "win32":
+            try:
+                import winsound
+                winsound.PlaySound(None, winsound.SND_PURGE)
+            except (ImportError, RuntimeError):
+                pass
+        else:
+            player = self._player
+            if player is not None:
+                try:
+                    player.terminate()
+                except OSError:
+                    pass
+        # Also abort any render in progress.
+        try:
+            self.engine.stop()
+        except (AttributeError, RuntimeError) as e:
+            # AttributeError: engine not created yet (worker still
+            # starting); RuntimeError: driver loop already stopped.
+            print(f"Stop error: {e}")
+
+    def get_available_voices(self):
+        """Return (id, name) pairs of installed voices."""
+        return [(voice.id, voice.name) for voice in self._voices]
+
+    def change_voice(self, voice_id):
+        """Switch to a different installed voice."""
+        try:
+            if any(voice.id == voice_id for voice in self._voices):
+                self._set('voice', voice_id)
+                self._voice_id = voice_id
+                return True
+            return False
+        except Exception as e:
+            print(f"Voice change error: {e}")
+            return False
+
+    def set_rate(self, rate):
+        """Set speech rate in words per minute."""
+        self._set('rate', rate)
+        self._rate = rate
+
+    def set_volume(self, volume):
+        """Set output volume between 0.0 and 1.0."""
+        self._set('volume', volume)
+        self._volume = volume
+
+    def save_to_file(self, text, filename):
+        """Render text to an audio file instead of the speakers."""
+        try:
+            self._engine_ready.wait(timeout=5)
+            self._render(text, filename)
+            return True
+        except (OSError, RuntimeError) as e:
+            print(f"Save error: {e}")
+            return False
+
+    def shutdown(self):
+        """Stop both worker threads and the renderer child."""
+        self.running = False
+        self._wake.set()
+        if self._render_proc:
+            try:
+                self._render_proc.terminate()
+            except OSError:
+                pass
@@ -0,0 +1,38 @@
+"""Out-of-process pyttsx3 renderer for JARVIS.
+
+Run as a child of TextToSpeech. Reads one JSON request per line on
+stdin — {"text", "path", "voice", "rate", "volume"} — renders the text
+to a WAV at path, and answers "ok" (or "err: ...") on stdout. Keeping
+the SAPI5 COM apartment in its own process sidesteps pyttsx3's
+threading freeze entirely and keeps synthesis off the assistant's GIL.
+"""
+
+import json
+import sys
+
+import pyttsx3
+
+
+def main():
+    engine = pyttsx3.init()
+    last = {"voice": None, "rate": None, "volume": None}
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            req = json.loads(line)
+            for key in ("voice", "rate", "volume"):
+                value = req.get(key)
+                if value not in (None, "") and value != last[key]:
+                    engine.setProperty(key, value)
+                    last[key] = value
+            engine.save_to_file(req["text"], req["path"])
+            engine.runAndWait()
+            print("ok", flush=True)
+        except Exception as e:
+            print(f"err: {e}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
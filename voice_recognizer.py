@@ -0,0 +1,360 @@
+"""Microphone capture and speech-to-text for JARVIS."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+
+#: Where a local Vosk model is looked for; override via VOSK_MODEL_PATH.
+VOSK_MODEL_PATH = os.getenv(
+    "VOSK_MODEL_PATH", os.path.expanduser("~/.jarvis/vosk-model-small-en"))
+
+#: Persisted ambient-noise calibration, keyed by mic device and rate.
+CALIB_PATH = os.path.expanduser("~/.jarvis/mic_calib.json")
+
+
+class VoiceRecognizer:
+    """Wraps SpeechRecognition with wake-word-friendly helpers."""
+
+    #: Phrases that wake the assistant from continuous listening.
+    WAKE_WORDS = ("hey jarvis", "ok jarvis", "jarvis")
+
+    def __init__(self, device_index=None):
+        self.recognizer = sr.Recognizer()
+        # 16kHz is what Vosk, webrtcvad and the cloud configs all want;
+        # capturing at the device default (usually 44.1kHz) just forces
+        # a Python-side resample of every utterance before recognition.
+        self.microphone = sr.Microphone(
+            device_index=device_index, sample_rate=16000, chunk_size=1024)
+        self.lock = threading.Lock()
+        self.listening = False
+        # Streaming Speech client, created lazily on first use; False
+        # marks "tried and unavailable" so we probe only once.
+        self._cloud_client = None
+        self._speech = None
+        # Local Vosk recognizer, same lazy probe-once convention. The
+        # KaldiRecognizer is stateful and not thread-safe, so both its
+        # creation and every decode hold this lock.
+        self._vosk = None
+        self._vosk_lock = threading.Lock()
+        # webrtcvad endpoint detector, likewise probed once.
+        self._vad = None
+
+        self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.pause_threshold = 0.8
+        self._calibrate()
+
+    def _calibrate(self):
+        """Set the energy threshold from cache or a fresh measurement.
+
+        adjust_for_ambient_noise blocks a full two seconds; a reading
+        from the last 24 hours for the same device and rate is close
+        enough, since dynamic_energy_threshold keeps correcting it at
+        runtime. Stale or missing entries trigger a real calibration,
+        which is then persisted.
+        """
+        key = f"{self.microphone.device_index}:{self.microphone.SAMPLE_RATE}"
+        data = {}
+        try:
+            with open(CALIB_PATH, encoding="utf-8") as f:
+                data = json.load(f)
+            entry = data.get(key)
+            if entry and time.time() - entry["time"] < 86400:
+                self.recognizer.energy_threshold = entry["energy"]
+                return
+        except (OSError, ValueError, KeyError):
+            data = {}
+
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source, duration=2)
+        try:
+            os.makedirs(os.path.dirname(CALIB_PATH), exist_ok=True)
+            data[key] = {
+                "energy": self.recognizer.energy_threshold,
+                "time": time.time(),
+            }
+            with open(CALIB_PATH, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Calibration cache error: {e}")
+
+    def listen(self, timeout=5, phrase_time_limit=10):
+        """Capture one utterance and return its lowercased transcript.
+
+        Only the capture holds self.lock — the mic is the contended
+        resource. Recognition (a blocking network call in the worst
+        case) runs after the lock is released, so another thread can
+        already be recording the next utterance.
+        """
+        try:
+            with self.lock:
+                with self.microphone as source:
+                    audio = self._capture(source, timeout, phrase_time_limit)
+        except sr.WaitTimeoutError:
+            return None
+        except Exception as e:
+            print(f"Listen error: {e}")
+            return None
+        return self._transcribe(audio)
+
+    def _transcribe(self, audio):
+        """Recognize captured audio, lock-free; None on no transcript."""
+        try:
+            text = self._recognize(audio)
+            return text.lower() if text else None
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            print(f"Speech service error: {e}")
+            return None
+        except Exception as e:
+            print(f"Recognition error: {e}")
+            return None
+
+    def _get_cloud_client(self):
+        """The google-cloud-speech client, if credentials allow one."""
+        if self._cloud_client is None:
+            self._cloud_client = False
+            if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+                try:
+                    from google.cloud import speech
+                    self._speech = speech
+                    self._cloud_client = speech.SpeechClient()
+                except ImportError:
+                    pass
+        return self._cloud_client or None
+
+    def _get_vad(self):
+        """A webrtcvad detector, if the package is installed."""
+        if self._vad is None:
+            self._vad = False
+            try:
+                import webrtcvad
+                self._vad = webrtcvad.Vad(2)
+            except ImportError:
+                pass
+        return self._vad or None
+
+    def _capture(self, source, timeout, phrase_time_limit):
+        """Record one utterance, VAD-endpointed when possible.
+
+        webrtcvad only accepts 16-bit mono at a few sample rates, so
+        the energy-threshold state machine stays as the fallback.
+        """
+        vad = self._get_vad()
+        if (vad is not None and source.SAMPLE_WIDTH == 2
+                and source.SAMPLE_RATE in (8000, 16000, 32000, 48000)):
+            return self._listen_vad(source, timeout, phrase_time_limit)
+        return self.recognizer.listen(
+            source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
+    def _listen_vad(self, source, timeout, phrase_time_limit):
+        """Endpoint an utterance with webrtcvad's 30ms C-kernel frames.
+
+        The phrase ends after pause_threshold seconds of trailing
+        silence, same budget as the energy-based recognizer — the win
+        here is the cheaper, more accurate per-frame speech decision,
+        not a shorter pause. Cutting the pause much below that truncates
+        commands at natural mid-sentence hesitations ("open ... chrome").
+        """
+        vad = self._vad
+        rate = source.SAMPLE_RATE
+        frame_samples = int(rate * 0.03)
+        silence_limit = max(1, int(self.recognizer.pause_threshold / 0.03))
+        frames = []
+        silence = 0
+        started = False
+        start = phrase_start = time.monotonic()
+
+        while True:
+            now = time.monotonic()
+            if not started and timeout and now - start > timeout:
+                raise sr.WaitTimeoutError("listening timed out")
+            if (started and phrase_time_limit
+                    and now - phrase_start > phrase_time_limit):
+                break
+            frame = source.stream.read(frame_samples)
+            if vad.is_speech(frame, rate):
+                if not started:
+                    started = True
+                    phrase_start = now
+                frames.append(frame)
+                silence = 0
+            elif started:
+                frames.append(frame)
+                silence += 1
+                if silence >= silence_limit:
+                    break
+        return sr.AudioData(b"".join(frames), rate, source.SAMPLE_WIDTH)
+
+    def _get_vosk(self):
+        """A local Vosk recognizer, if the package and model exist."""
+        with self._vosk_lock:
+            if self._vosk is None:
+                self._vosk = False
+                if os.path.isdir(VOSK_MODEL_PATH):
+                    try:
+                        import vosk
+                        self._vosk = vosk.KaldiRecognizer(
+                            vosk.Model(VOSK_MODEL_PATH), 16000)
+                    except Exception as e:
+                        print(f"Vosk init error: {e}")
+            return self._vosk or None
+
+    def _recognize_vosk(self, audio):
+        """Decode an utterance on-device; empty string on no speech.
+
+        Serialized: two interleaved AcceptWaveform/FinalResult calls on
+        one KaldiRecognizer corrupt its decoder state.
+        """
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        with self._vosk_lock:
+            recognizer = self._vosk
+            recognizer.AcceptWaveform(raw)
+            return json.loads(recognizer.FinalResult()).get("text", "")
+
+    def _recognize(self, audio):
+        """Transcribe captured audio: local model, then the cloud.
+
+        A local Vosk model skips the network round-trip entirely and
+        works offline; failing that, the gRPC stream starts decoding
+        while audio is still uploading, and the plain recognize_google
+        path remains the keyless fallback.
+        """
+        vosk_rec = self._get_vosk()
+        if vosk_rec is not None:
+            try:
+                text = self._recognize_vosk(audio)
+                if text:
+                    return text
+            except Exception as e:
+                print(f"Local recognition error: {e}")
+        client = self._get_cloud_client()
+        if client is not None:
+            try:
+                return self._recognize_streaming(client, audio)
+            except Exception as e:
+                print(f"Streaming recognition error: {e}")
+        return self.recognizer.recognize_google(audio)
+
+    def _recognize_streaming(self, client, audio):
+        """Run one utterance through streaming_recognize."""
+        speech = self._speech
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=16000,
+                language_code="en-US"),
+            single_utterance=True)
+        chunk = 3200  # 100ms of 16kHz 16-bit mono
+        requests = (
+            speech.StreamingRecognizeRequest(audio_content=raw[i:i + chunk])
+            for i in range(0, len(raw), chunk))
+        for response in client.streaming_recognize(
+                config=config, requests=requests):
+            for result in response.results:
+                if result.is_final and result.alternatives:
+                    return result.alternatives[0].transcript
+        return None
+
+    @staticmethod
+    def _build_wake_matcher(wake_words):
+        """Predicate for "transcript contains a wake phrase".
+
+        With pyahocorasick installed, all phrases are folded into one
+        automaton scanned in a single O(n) C pass regardless of how
+        many aliases exist; otherwise a plain substring sweep.
+        """
+        try:
+            import ahocorasick
+            automaton = ahocorasick.Automaton()
+            for word in wake_words:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            return lambda text: next(automaton.iter(text), None) is not None
+        except ImportError:
+            words = tuple(wake_words)
+            return lambda text: any(word in text for word in words)
+
+    def listen_continuously(self, callback, wake_words=WAKE_WORDS):
+        """Invoke callback with a transcript after each wake-word hit."""
+        self.listening = True
+        matcher = self._build_wake_matcher(wake_words)
+        thread = threading.Thread(
+            target=self._wake_loop, args=(callback, matcher), daemon=True)
+        thread.start()
+        return thread
+
+    def _wake_loop(self, callback, matcher):
+        """Watch for the wake word, then transcribe the command.
+
+        With pvporcupine installed, a tiny always-on classifier scans
+        raw PCM frames at a fraction of a percent of CPU and full STT
+        runs only after it fires — no cloud quota or recognition work
+        while the room is quiet. Without it, the old poll-and-match
+        loop is the fallback.
+        """
+        porcupine = stream = pa = None
+        try:
+            import pvporcupine
+            import pyaudio
+            porcupine = pvporcupine.create(keywords=["jarvis"])
+            pa = pyaudio.PyAudio()
+            stream = pa.open(
+                rate=porcupine.sample_rate, channels=1,
+                format=pyaudio.paInt16, input=True,
+                frames_per_buffer=porcupine.frame_length)
+        except Exception:
+            porcupine = None
+
+        if porcupine is None:
+            # One stream for the whole loop; per-iteration mic opens
+            # were a full PyAudio open/close every second. Recognition
+            # is handed to a small pool so transcribing utterance N
+            # overlaps capturing N+1.
+            pool = ThreadPoolExecutor(max_workers=2)
+            source = self.microphone.__enter__()
+            try:
+                while self.listening:
+                    try:
+                        with self.lock:
+                            audio = self._capture(source, 1, 5)
+                    except sr.WaitTimeoutError:
+                        continue
+                    except Exception as e:
+                        print(f"Listen error: {e}")
+                        continue
+                    pool.submit(self._match_wake, audio, matcher, callback)
+            finally:
+                self.microphone.__exit__(None, None, None)
+                pool.shutdown(wait=False)
+            return
+
+        import struct
+        frame_fmt = "h" * porcupine.frame_length
+        try:
+            while self.listening:
+                pcm = stream.read(
+                    porcupine.frame_length, exception_on_overflow=False)
+                if porcupine.process(struct.unpack_from(frame_fmt, pcm)) >= 0:
+                    text = self.listen(timeout=5, phrase_time_limit=10)
+                    if text:
+                        callback(text)
+        finally:
+            stream.close()
+            pa.terminate()
+            porcupine.delete()
+
+    def _match_wake(self, audio, matcher, callback):
+        """Transcribe one polled utterance and fire on a wake phrase."""
+        text = self._transcribe(audio)
+        if text and matcher(text):
+            callback(text)
+
+    def stop_listening(self):
+        """Ask the continuous listener to exit."""
+        self.listening = False